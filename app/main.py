@@ -8,6 +8,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import sys
 import os
+import time
+import asyncio
+import queue
+import threading
 from typing import Optional, Any, Callable
 
 # Add project root to path first
@@ -21,6 +25,48 @@ from guis.status_bar import EnhancedStatusBar
 
 class RikudoCreatorApp:
     """Enhanced Rikudo Puzzle Creator with Phase 3 undo/redo functionality."""
+
+    __slots__ = (
+        "root", "grid", "canvas", "constraint_editor",
+        # Tk variables and widgets
+        "status_var", "mode_var", "validation_var", "history_var",
+        "rows_var", "cols_var", "enhanced_status_bar",
+        "undo_button", "redo_button",
+        "edit_cells_radio", "place_constraints_radio", "mark_center_radio", "select_radio",
+        "_edit_radios",
+        "_help_frame", "_help_button",
+        # Deferred refresh / caching state
+        "_dirty", "_flush_scheduled", "_stats_cache", "_last_text",
+        "_last_status_ms", "_pending_status", "_last_history_key",
+        "_new_grid_pending",
+        "_async_loop", "_async_results", "_async_pending",
+        # Batch Operations dialog
+        "_batch_ops_dialog", "_batch_ops_frame", "_batch_subtitle",
+        "_batch_buttons", "_batch_ops",
+    )
+
+    # Minimum spacing between status bar rebuilds (~20 Hz cap)
+    STATUS_MIN_INTERVAL_MS = 50
+
+    # How often the Tk thread checks for finished background jobs
+    ASYNC_POLL_MS = 50
+
+    # Status bar text per edit mode (full message / short status prefix)
+    _MODE_STATUS = {
+        "cell": "Cell Edit Mode: Left=cycle states, Right=enter numbers",
+        "constraint": "Constraint Mode: Click two adjacent cells to add/remove dots",
+        "center": "Center Mode: Left click to mark/unmark center cell",
+        "select": "Select / Inspect: Left=highlight neighbors, Esc=clear",
+    }
+    _MODE_SHORT = {
+        "cell": "Cell Edit",
+        "constraint": "Constraint",
+        "center": "Center",
+    }
+
+    # Fixed leading fields of the status line
+    _STATUS_HEAD_FMT = "%s Mode | Playable: %d | Empty: %d | Filled: %d | Blocked: %d"
+    _BATCH_STATUS_FMT = "Batch Selection Mode | Selected: %d | Playable: %d | Dots: %d"
     
     def __init__(self):
         """Initialize the application."""
@@ -45,6 +91,40 @@ class RikudoCreatorApp:
         # Undo/Redo button references
         self.undo_button = None
         self.redo_button = None
+
+        # Deferred UI refresh: update requests only mark sections dirty and the
+        # actual recomputation runs once per Tk idle cycle (see _flush_updates)
+        self._dirty = {"status": False, "validation": False, "history": False}
+        self._flush_scheduled = False
+
+        # Memoized grid.get_statistics() result, keyed by grid.revision
+        self._stats_cache = (None, -1)
+
+        # Status bar rate limiting (see STATUS_MIN_INTERVAL_MS)
+        self._last_status_ms = 0
+        self._pending_status = False
+
+        # Last rendered history state; identical refreshes are skipped
+        self._last_history_key = None
+
+        # Last text written to each status StringVar (see _set_text)
+        self._last_text = {}
+
+        # Set while a New Grid request is waiting to run (debounce)
+        self._new_grid_pending = False
+
+        # Background asyncio loop for file I/O; started in run()
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Finished (on_done, future) pairs; the worker side never touches Tk
+        self._async_results: queue.SimpleQueue = queue.SimpleQueue()
+        self._async_pending = 0  # Jobs whose on_done has not run yet
+
+        # Batch Operations dialog, built once and then shown/hidden
+        self._batch_ops_dialog: Optional[tk.Toplevel] = None
+        self._batch_ops_frame: Optional[ttk.Frame] = None
+        self._batch_subtitle: Optional[ttk.Label] = None
+        self._batch_buttons = {}  # op name -> Button (or Separator for "---")
+        self._batch_ops = {}      # op name -> callable, as offered at last show
         
         self._create_ui()
         self._create_default_grid()
@@ -70,19 +150,15 @@ class RikudoCreatorApp:
 
     def _set_edit_mode_enabled(self, enabled: bool):
         """Enable or disable edit mode radio buttons."""
-        state = "normal" if enabled else "disabled"
-        
-        # Disable/enable all radio buttons
-        self.edit_cells_radio.config(state=state)
-        self.place_constraints_radio.config(state=state)
-        self.mark_center_radio.config(state=state)
-        self.select_radio.config(state=state)
+        # ttk state flags: no option reconfiguration, just a state-bit flip
+        state_spec = ("!disabled",) if enabled else ("disabled",)
+        for radio in self._edit_radios:
+            radio.state(state_spec)
 
     def _is_batch_selection_active(self) -> bool:
         """Check if batch selection mode is currently active."""
-        return (hasattr(self.canvas, 'constraint_editor') and 
-                self.canvas.constraint_editor and 
-                self.canvas.constraint_editor.selection_mode)
+        editor = self.canvas.constraint_editor
+        return editor is not None and editor.selection_mode
 
     def _create_control_panel(self, parent):
         """Create the enhanced left control panel with space-saving layout."""
@@ -153,6 +229,9 @@ class RikudoCreatorApp:
         self.select_radio = ttk.Radiobutton(mode_frame, text="Select / Inspect", variable=self.mode_var,
                     value="select", command=self._change_mode)
         self.select_radio.pack(anchor=tk.W)
+
+        self._edit_radios = (self.edit_cells_radio, self.place_constraints_radio,
+                             self.mark_center_radio, self.select_radio)
         
         # Validation section
         validation_frame = ttk.LabelFrame(parent, text="Validation", padding=5)
@@ -177,7 +256,18 @@ class RikudoCreatorApp:
         # Instructions section - Compact version
         help_frame = ttk.LabelFrame(parent, text="Instructions - Phase 4", padding=5)
         help_frame.pack(fill=tk.X, pady=(0, 10))
-        
+        self._help_frame = help_frame
+
+        # Text widget is built on first request (see _populate_help)
+        self._help_button = ttk.Button(help_frame, text="Show instructions", command=self._populate_help)
+        self._help_button.pack(fill=tk.X, pady=2)
+
+    def _populate_help(self):
+        """Replace the placeholder button with the instructions text."""
+        help_frame = self._help_frame
+        self._help_button.destroy()
+        self._help_button = None
+
         instructions = """RIKUDO PUZZLE CREATOR - PHASE 4
 
 ADVANCED CONSTRAINTS:
@@ -251,12 +341,21 @@ WORKFLOW:
     def _create_default_grid(self):
         """Create the initial default grid."""
         self.grid = HexGrid(7, 7)
+        self._invalidate_stats()
         self.canvas.set_grid(self.grid)
         self._update_status()
         self._update_history_status()
     
     def _create_new_grid(self):
+        """Schedule a new grid; repeated requests within 150 ms collapse into one."""
+        if self._new_grid_pending:
+            return
+        self._new_grid_pending = True
+        self.root.after(150, self._do_create_new_grid)
+    
+    def _do_create_new_grid(self):
         """Create a new grid with specified dimensions."""
+        self._new_grid_pending = False
         try:
             rows = int(self.rows_var.get())
             cols = int(self.cols_var.get())
@@ -274,19 +373,19 @@ WORKFLOW:
                     return
             
             # Exit batch selection mode if active
-            if hasattr(self.canvas, 'constraint_editor') and self.canvas.constraint_editor:
+            if self.canvas.constraint_editor is not None:
                 if self.canvas.constraint_editor.selection_mode:
                     self.canvas.constraint_editor.exit_selection_mode()
                     self._set_edit_mode_enabled(True)
             
             # Create new grid
             self.grid = HexGrid(rows, cols)
+            self._invalidate_stats()
             self.canvas.set_grid(self.grid)
             
             # Reset constraint editor
-            if hasattr(self.canvas, 'constraint_editor'):
-                self.canvas.constraint_editor = None
-                self.canvas.enhanced_mode = False
+            self.canvas.constraint_editor = None
+            self.canvas.enhanced_mode = False
             
             self._update_status()
             self._update_history_status()
@@ -295,12 +394,24 @@ WORKFLOW:
             messagebox.showerror("Invalid Input", 
                             "Please enter valid integer dimensions.")
     
+    def _stats(self) -> dict:
+        """Return grid statistics, recomputed only when grid.revision changes."""
+        stats, revision = self._stats_cache
+        if stats is None or revision != self.grid.revision:
+            stats = self.grid.get_statistics()
+            self._stats_cache = (stats, self.grid.revision)
+        return stats
+
+    def _invalidate_stats(self):
+        """Drop memoized statistics (grid object replaced)."""
+        self._stats_cache = (None, -1)
+
     def _has_puzzle_content(self) -> bool:
         """Check if current puzzle has any content."""
         if not self.grid:
             return False
         
-        stats = self.grid.get_statistics()
+        stats = self._stats()
         return (stats['prefilled_cells'] > 0 or 
                 stats['blocked_cells'] > 0 or 
                 stats['hole_cells'] > 0 or 
@@ -314,11 +425,32 @@ WORKFLOW:
             if not result:
                 return
         
-        self.canvas.import_puzzle()
+        path = self.canvas.ask_import_path()
+        if not path:
+            return
+        
+        # Read/parse the file off the Tk thread, then apply it in _finish_import
+        self.submit_async(self._aimport_puzzle(path), self._finish_import)
+    
+    async def _aimport_puzzle(self, path: str) -> dict:
+        """Read the puzzle file in the loop's default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, HexCanvas.read_import_file, path)
+    
+    def _finish_import(self, future):
+        """Apply a parsed puzzle file (Tk thread)."""
+        try:
+            json_data = future.result()
+        except Exception as e:
+            messagebox.showerror("Import Error", f"Failed to read JSON: {e}")
+            return
+        
+        self.canvas.apply_import(json_data)
         
         # Update grid reference and dimensions
-        if hasattr(self.canvas, 'grid') and self.canvas.grid:
+        if self.canvas.grid:
             self.grid = self.canvas.grid
+            self._invalidate_stats()
             self.rows_var.set(str(self.grid.rows))
             self.cols_var.set(str(self.grid.cols))
             self._update_status()
@@ -372,20 +504,10 @@ WORKFLOW:
         if mode != "select" and hasattr(self.canvas, "clear_inspect_overlay"):
             self.canvas.clear_inspect_overlay()
         
-        # Normal mode change handling
-        if mode == "cell":
-            mode_status = "Cell Edit Mode: Left=cycle states, Right=enter numbers"
-        elif mode == "constraint":
-            mode_status = "Constraint Mode: Click two adjacent cells to add/remove dots"
-        elif mode == "center":
-            mode_status = "Center Mode: Left click to mark/unmark center cell"
-        elif mode == "select":
-            mode_status = "Select / Inspect: Left=highlight neighbors, Esc=clear"
-        else:
-            mode_status = f"{mode} Mode"
+        mode_status = self._MODE_STATUS.get(mode) or f"{mode} Mode"
         
         self.enhanced_status_bar.update_main_status(mode_status)
-        self.status_var.set(mode_status)
+        self._set_text(self.status_var, mode_status)
     
     def _on_grid_change(self):
         """Handle grid state changes."""
@@ -396,112 +518,174 @@ WORKFLOW:
         """Handle undo/redo history changes."""
         self._update_history_status()
 
+    # Deferred refresh scheduling
+
+    def _mark_dirty(self, *sections: str):
+        """Flag UI sections for refresh and schedule a single idle flush."""
+        for section in sections:
+            self._dirty[section] = True
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Schedule _flush_updates on the next idle cycle (at most once)."""
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        self.root.after_idle(self._flush_updates)
+
+    def _flush_updates(self):
+        """Run every pending refresh exactly once, then clear the dirty flags."""
+        self._flush_scheduled = False
+        dirty = self._dirty
+        if dirty["status"]:
+            dirty["status"] = False
+            self._refresh_status_throttled()
+        if dirty["validation"]:
+            dirty["validation"] = False
+            self._do_update_validation_status()
+        if dirty["history"]:
+            dirty["history"] = False
+            self._do_update_history_status()
+
+    def _refresh_status_throttled(self):
+        """Rebuild the status bar at most once per STATUS_MIN_INTERVAL_MS.
+
+        Requests arriving inside the interval are dropped; a single trailing
+        refresh is scheduled so the latest state is always rendered.
+        """
+        now = int(time.monotonic() * 1000)
+        elapsed = now - self._last_status_ms
+        if elapsed < self.STATUS_MIN_INTERVAL_MS:
+            if not self._pending_status:
+                self._pending_status = True
+                self.root.after(self.STATUS_MIN_INTERVAL_MS - elapsed, self._maybe_flush_status)
+            return
+        self._last_status_ms = now
+        self._do_update_status()
+
+    def _maybe_flush_status(self):
+        """Trailing edge of the status throttle."""
+        if self._pending_status:
+            self._pending_status = False
+            self._refresh_status_throttled()
+
+    def _set_text(self, var: tk.StringVar, text: str):
+        """Write a status StringVar only when the text actually changes."""
+        key = str(var)
+        if self._last_text.get(key) != text:
+            self._last_text[key] = text
+            var.set(text)
+
     def _update_status(self):
+        """Request a status bar refresh (coalesced per idle cycle)."""
+        self._mark_dirty("status")
+
+    def _update_validation_status(self):
+        """Request a validation status refresh (coalesced per idle cycle)."""
+        self._mark_dirty("validation")
+
+    def _update_history_status(self):
+        """Request an undo/redo status refresh (coalesced per idle cycle)."""
+        self._mark_dirty("history")
+
+    def _do_update_status(self):
         """Update status bar with current grid statistics."""
         if self.grid is None:
             return
         
         # FIXED: Don't override status if batch selection is active
-        if (hasattr(self.canvas, 'constraint_editor') and 
-            self.canvas.constraint_editor and 
-            self.canvas.constraint_editor.selection_mode):
+        if self._is_batch_selection_active():
             # Batch selection is active - only update the old status var for backward compatibility
             # but don't override the enhanced status bar main message
-            stats = self.grid.get_statistics()
-            mode_text = "Batch Selection"
-            
-            status_parts = [
-                f"{mode_text} Mode",
-                f"Selected: {len(self.canvas.constraint_editor.selected_cells)}",
-                f"Playable: {stats['total_playable']}",
-                f"Dots: {stats['dot_constraints']}"
-            ]
+            stats = self._stats()
+            status_text = self._BATCH_STATUS_FMT % (
+                len(self.canvas.constraint_editor.selected_cells),
+                stats['total_playable'], stats['dot_constraints'])
             
             # Update only the old status var, leave enhanced status bar alone
-            self.status_var.set(" | ".join(status_parts))
+            self._set_text(self.status_var, status_text)
             return
         
         # Normal status update when NOT in batch selection mode
-        stats = self.grid.get_statistics()
-        mode_text = {
-            "cell": "Cell Edit",
-            "constraint": "Constraint", 
-            "center": "Center"
-        }.get(self.mode_var.get(), "Unknown")
+        stats = self._stats()
+        mode_text = self._MODE_SHORT.get(self.mode_var.get(), "Unknown")
         
         # Build status message for enhanced status bar
-        status_parts = [
-            f"{mode_text} Mode",
-            f"Playable: {stats['total_playable']}",
-            f"Empty: {stats['empty_cells']}",
-            f"Filled: {stats['prefilled_cells']}",
-            f"Blocked: {stats['blocked_cells']}",
-        ]
+        status_parts = [self._STATUS_HEAD_FMT % (
+            mode_text, stats['total_playable'], stats['empty_cells'],
+            stats['prefilled_cells'], stats['blocked_cells'])]
         
         if stats['hole_cells'] > 0:
-            status_parts.append(f"Holes: {stats['hole_cells']}")
+            status_parts.append("Holes: %d" % stats['hole_cells'])
         
-        status_parts.append(f"Dots: {stats['dot_constraints']}")
+        status_parts.append("Dots: %d" % stats['dot_constraints'])
         
         if stats['center_cells'] > 0:
-            status_parts.append(f"Center: {stats['center_cells']}")
+            status_parts.append("Center: %d" % stats['center_cells'])
         
-        if stats['is_connected']:
-            status_parts.append("✓Connected")
-        else:
-            status_parts.append("⚠ Disconnected")
+        status_parts.append("✓Connected" if stats['is_connected'] else "⚠ Disconnected")
         
         # Update enhanced status bar
-        self.enhanced_status_bar.update_main_status(" | ".join(status_parts))
+        status_text = " | ".join(status_parts)
+        self.enhanced_status_bar.update_main_status(status_text)
         
         # Also update the old status var for backward compatibility
-        self.status_var.set(" | ".join(status_parts))
+        self._set_text(self.status_var, status_text)
 
-    def _update_validation_status(self):
+    def _do_update_validation_status(self):
         """Update validation status display."""
         if self.grid is None:
-            self.validation_var.set("No puzzle")
+            self._set_text(self.validation_var, "No puzzle")
             return
         
+        # Memoized per grid revision, so repeat refreshes are cheap
         validation_errors = self.grid.validate_puzzle()
-        errors = [e for e in validation_errors if e.severity == "error"]
-        warnings = [e for e in validation_errors if e.severity == "warning"]
+        
+        errors = warnings = 0
+        for e in validation_errors:
+            if e.severity == "error":
+                errors += 1
+            elif e.severity == "warning":
+                warnings += 1
         
         # Update enhanced status bar
-        self.enhanced_status_bar.update_validation_status(len(errors), len(warnings))
+        self.enhanced_status_bar.update_validation_status(errors, warnings)
         
         # Update old status var for backward compatibility
         if errors:
-            self.validation_var.set(f"❌ {len(errors)} errors")
+            self._set_text(self.validation_var, f"❌ {errors} errors")
         elif warnings:
-            self.validation_var.set(f"⚠️ {len(warnings)} warnings")
+            self._set_text(self.validation_var, f"⚠️ {warnings} warnings")
         else:
-            stats = self.grid.get_statistics()
+            stats = self._stats()
             if stats['is_connected'] and stats['total_playable'] > 0:
-                self.validation_var.set("✅ Valid puzzle")
+                self._set_text(self.validation_var, "✅ Valid puzzle")
             else:
-                self.validation_var.set("⚠️ Incomplete")
+                self._set_text(self.validation_var, "⚠️ Incomplete")
     
-    def _update_history_status(self):
+    def _do_update_history_status(self):
         """Update undo/redo status display."""
         if self.grid is None:
-            self.history_var.set("No grid")
+            self._last_history_key = None
+            self._set_text(self.history_var, "No grid")
             self.undo_button.config(state="disabled")
             self.redo_button.config(state="disabled")
             return
         
-        # Update button states
-        can_undo = self.grid.can_undo()
-        can_redo = self.grid.can_redo()
+        # Nothing changed since the last refresh - leave the widgets alone
+        history = self.grid.command_history
+        key = (history, history.version)
+        if key == self._last_history_key:
+            return
+        self._last_history_key = key
+        
+        total_commands, _, can_undo, can_redo = history.get_counts()
+        undo_desc, redo_desc = history.get_names()
         
+        # Update button states
         self.undo_button.config(state="normal" if can_undo else "disabled")
         self.redo_button.config(state="normal" if can_redo else "disabled")
         
-        # Get operation descriptions
-        history_info = self.grid.get_history_info()
-        undo_desc = history_info["undo_description"]
-        redo_desc = history_info["redo_description"]
-        
         # Update old status var for backward compatibility
         parts = []
         if can_undo and undo_desc:
@@ -513,13 +697,49 @@ WORKFLOW:
             parts.append(f"Redo: {short_desc}")
         
         if not parts:
-            parts.append(f"Operations: {history_info['total_commands']}")
+            parts.append(f"Operations: {total_commands}")
         
-        self.history_var.set(" | ".join(parts) if parts else "No operations")
+        self._set_text(self.history_var, " | ".join(parts) if parts else "No operations")
     
     def run(self):
         """Start the application."""
-        self.root.mainloop()
+        self._async_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._async_loop.run_forever, daemon=True).start()
+        try:
+            self.root.mainloop()
+        finally:
+            self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+    
+    def submit_async(self, coro, on_done: Optional[Callable] = None):
+        """
+        Run a coroutine on the background asyncio loop.
+        
+        on_done, if given, is called on the Tk thread with the finished
+        concurrent.futures.Future.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._async_loop)
+        if on_done is not None:
+            # Runs on the asyncio thread: only hand the result over, no Tk calls
+            future.add_done_callback(lambda f: self._async_results.put((on_done, f)))
+            self._async_pending += 1
+            if self._async_pending == 1:
+                self.root.after(self.ASYNC_POLL_MS, self._poll_async_results)
+        return future
+    
+    def _poll_async_results(self):
+        """Run on_done callbacks of finished jobs (Tk thread); poll while any are pending."""
+        try:
+            while True:
+                try:
+                    on_done, future = self._async_results.get_nowait()
+                except queue.Empty:
+                    break
+                self._async_pending -= 1
+                on_done(future)
+        finally:
+            # Keep polling even if a callback raised
+            if self._async_pending:
+                self.root.after(self.ASYNC_POLL_MS, self._poll_async_results)
 
     def _toggle_batch_selection(self):
         """Toggle batch constraint selection mode."""
@@ -528,24 +748,20 @@ WORKFLOW:
             return
         
         # Initialize enhanced mode and constraint editor if needed
-        if not hasattr(self.canvas, 'enhanced_mode') or not self.canvas.enhanced_mode:
+        if not self.canvas.enhanced_mode:
             self.canvas.set_enhanced_mode(True)
         
-        if not hasattr(self.canvas, 'constraint_editor') or self.canvas.constraint_editor is None:
+        if self.canvas.constraint_editor is None:
             self.canvas.constraint_editor = ConstraintEditor(self.canvas, self.grid)
+        self.canvas.constraint_editor.status_sink = self.enhanced_status_bar.update_main_status
         
         # Toggle selection mode
         if self.canvas.constraint_editor.selection_mode:
             # Exit batch selection mode
             self.canvas.constraint_editor.exit_selection_mode()
 
-            # If Batch Operations window is open, close it
-            dlg = getattr(self, "_batch_ops_dialog", None)
-            if dlg and dlg.winfo_exists():
-                try:
-                    dlg.destroy()
-                finally:
-                    self._batch_ops_dialog = None
+            # If Batch Operations window is open, hide it
+            self._hide_batch_operations_menu()
             
             # Re-enable edit mode controls
             self._set_edit_mode_enabled(True)
@@ -579,12 +795,12 @@ WORKFLOW:
     The edit mode controls will be restored when you exit batch selection.""")
         
         # Redraw to show changes and update status
-        self.canvas.redraw_grid()
+        self.canvas.redraw_idle()
         self._update_status()
 
     def _show_batch_operations_menu(self):
         """Show batch operations menu for selected cells."""
-        if not hasattr(self.canvas, 'constraint_editor') or not self.canvas.constraint_editor:
+        if self.canvas.constraint_editor is None:
             return
             
         operations = self.canvas.constraint_editor.get_batch_operations_menu()
@@ -594,24 +810,49 @@ WORKFLOW:
             messagebox.showinfo("No Operations", "No batch operations available.")
             return
         
-        # Create operations menu dialog
+        self._batch_ops = operations
+        dialog = self._batch_ops_dialog
+        if dialog is None or not dialog.winfo_exists():
+            dialog = self._build_batch_operations_dialog()
+        
+        self._batch_subtitle.config(text=f"{selected_count} cells selected")
+        
+        # Re-pack the buttons for the operations currently on offer, in menu order
+        for widget in self._batch_buttons.values():
+            widget.pack_forget()
+        for op_name in operations:
+            widget = self._batch_buttons.get(op_name)
+            if widget is None:
+                if op_name == "---":  # Separator
+                    widget = ttk.Separator(self._batch_ops_frame, orient=tk.HORIZONTAL)
+                else:
+                    widget = ttk.Button(self._batch_ops_frame, text=op_name,
+                                        command=lambda n=op_name: self._execute_batch_operation(
+                                            self._batch_ops[n], self._batch_ops_dialog))
+                self._batch_buttons[op_name] = widget
+            if op_name == "---":
+                widget.pack(fill=tk.X, pady=10)
+            else:
+                widget.pack(fill=tk.X, pady=2, padx=10)
+        
+        dialog.deiconify()
+        dialog.grab_set()
+    
+    def _build_batch_operations_dialog(self) -> tk.Toplevel:
+        """Create the (initially hidden) Batch Operations dialog."""
         dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.title("Batch Operations")
         dialog.geometry("350x600")
         dialog.transient(self.root)
-        dialog.grab_set()
-        # Track the window so we can auto-close it when batch mode ends
-        self._batch_ops_dialog = dialog
-        dialog.protocol(
-            "WM_DELETE_WINDOW",
-            lambda d=dialog: (setattr(self, "_batch_ops_dialog", None), d.destroy())
-        )
+        # Closing only hides the window so it can be reused
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_batch_operations_menu)
         
         # Title
         title_label = ttk.Label(dialog, text=f"Batch Operations", font=("Arial", 14, "bold"))
         title_label.pack(pady=10)
         
-        subtitle_label = ttk.Label(dialog, text=f"{selected_count} cells selected", font=("Arial", 10))
+        subtitle_label = ttk.Label(dialog, text="", font=("Arial", 10))
         subtitle_label.pack(pady=(0, 10))
         
         # Scrollable frame for operations
@@ -627,31 +868,33 @@ WORKFLOW:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Operations buttons
-        for op_name, op_func in operations.items():
-            if op_name == "---":  # Separator
-                ttk.Separator(scrollable_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
-                continue
-                
-            btn = ttk.Button(scrollable_frame, text=op_name, 
-                            command=lambda f=op_func: self._execute_batch_operation(f, dialog))
-            btn.pack(fill=tk.X, pady=2, padx=10)
-        
         canvas.pack(side="left", fill="both", expand=True, padx=10)
         scrollbar.pack(side="right", fill="y")
         
         # Close button
-        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=10)
+        ttk.Button(dialog, text="Close", command=self._hide_batch_operations_menu).pack(pady=10)
+        
+        self._batch_ops_dialog = dialog
+        self._batch_ops_frame = scrollable_frame
+        self._batch_subtitle = subtitle_label
+        self._batch_buttons = {}
+        return dialog
+    
+    def _hide_batch_operations_menu(self):
+        """Hide the Batch Operations dialog (kept for reuse)."""
+        dialog = self._batch_ops_dialog
+        if dialog is not None and dialog.winfo_exists():
+            dialog.grab_release()
+            dialog.withdraw()
 
     def _execute_batch_operation(self, operation_func: Callable, dialog: tk.Toplevel):
         """Execute a batch operation and update the UI."""
         try:
             success = operation_func()
             if success:
-                self._update_status()
-                self._update_validation_status()
-                self._update_history_status()  # Update undo/redo status
-                self.canvas.redraw_grid()
+                # Marks all three sections dirty; refreshed once on the next idle cycle
+                self._mark_dirty("status", "validation", "history")
+                self.canvas.redraw_idle()
             # Don't close dialog automatically - let user perform multiple operations
         except Exception as e:
             messagebox.showerror("Operation Error", f"Failed to execute operation: {str(e)}")
@@ -663,11 +906,12 @@ WORKFLOW:
             return
         
         # Ensure enhanced mode and constraint editor are initialized
-        if not hasattr(self.canvas, 'enhanced_mode') or not self.canvas.enhanced_mode:
+        if not self.canvas.enhanced_mode:
             self.canvas.set_enhanced_mode(True)
         
-        if not hasattr(self.canvas, 'constraint_editor') or self.canvas.constraint_editor is None:
+        if self.canvas.constraint_editor is None:
             self.canvas.constraint_editor = ConstraintEditor(self.canvas, self.grid)
+        self.canvas.constraint_editor.status_sink = self.enhanced_status_bar.update_main_status
         
         # If in batch selection mode, show operations menu
         if self.canvas.constraint_editor.selection_mode and self.canvas.constraint_editor.selected_cells:
@@ -718,7 +962,7 @@ WORKFLOW:
             report_parts.append("")
         
         # Batch operations info
-        if hasattr(self.canvas, 'constraint_editor') and self.canvas.constraint_editor.selection_mode:
+        if self.canvas.constraint_editor.selection_mode:
             selected_count = len(self.canvas.constraint_editor.selected_cells)
             possible_constraints = len(self.canvas.constraint_editor.get_possible_constraints(
                 self.canvas.constraint_editor.selected_cells))
@@ -745,9 +989,7 @@ WORKFLOW:
 
     def _update_all_status(self):
         """Centralized status update method."""
-        self._update_status()
-        self._update_validation_status() 
-        self._update_history_status()
+        self._mark_dirty("status", "validation", "history")
 
 def main():
     """Main entry point."""
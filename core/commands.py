@@ -2,13 +2,26 @@
 Command pattern implementation for undo/redo functionality in Rikudo Puzzle Creator.
 Phase 3: Add reversible operations for all grid modifications.
 """
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Optional, Tuple, List, Any, Dict
 from enum import Enum
-from core.types import CellState
+from core.types import CellState, HOLE_ENTRY
+
+try:  # Optional: only used to shrink the undo stack under memory pressure
+    import psutil
+except ImportError:  # pragma: no cover - psutil is not a hard dependency
+    psutil = None
 
 class Command(ABC):
     """Abstract base class for all reversible commands."""
+
+    __slots__ = ()
+
+    # True after an execute() that returned False only because the grid
+    # already held the target state (nothing changed, nothing to record)
+    was_noop = False
     
     @abstractmethod
     def execute(self, grid) -> bool:
@@ -24,9 +37,23 @@ class Command(ABC):
     def get_description(self) -> str:
         """Get human-readable description of the command."""
         pass
+    
+    def merge_id(self) -> Optional[Tuple]:
+        """Key for merging consecutive commands into one history entry (None = never merge)."""
+        return None
+    
+    def merge(self, other: 'Command') -> bool:
+        """Absorb an already-executed command with the same merge_id. Returns True if merged."""
+        return False
+
+# Marks old_center_location as "not captured": the edit could not move the center
+_UNCHANGED = object()
 
 class SetCellStateCommand(Command):
     """Command to change cell state and value."""
+
+    __slots__ = ('row', 'col', 'new_state', 'new_value', 'old_state', 'old_value', 'old_center_location',
+                 'was_noop', '_desc')
     
     def __init__(self, row: int, col: int, new_state: CellState, new_value: Optional[int] = None):
         self.row = row
@@ -35,13 +62,22 @@ class SetCellStateCommand(Command):
         self.new_value = new_value
         self.old_state: Optional[CellState] = None
         self.old_value: Optional[int] = None
-        self.old_center_location: Optional[Tuple[int, int]] = None
+        self.old_center_location: Any = _UNCHANGED
+        self.was_noop = False
+        self._desc: Optional[str] = None  # Memoized get_description()
     
     def execute(self, grid) -> bool:
         """Execute the cell state change."""
         # Store old state for undo
-        self.old_state, self.old_value = grid.get_cell_state(self.row, self.col)
-        self.old_center_location = grid.center_location
+        self.old_state, self.old_value = grid.cell_states.get((self.row, self.col), HOLE_ENTRY)
+        self.old_center_location = (grid.center_location
+                                    if grid.might_move_center(self.row, self.col, self.new_state)
+                                    else _UNCHANGED)
+        
+        # Cell already in the requested state: report a no-op, don't mutate
+        self.was_noop = self.old_state == self.new_state and self.old_value == self.new_value
+        if self.was_noop:
+            return False
         
         # Execute the change
         grid.set_cell_state(self.row, self.col, self.new_state, self.new_value)
@@ -52,8 +88,8 @@ class SetCellStateCommand(Command):
         if self.old_state is None:
             return False
         
-        # Restore old center location if it was changed
-        if self.old_center_location != grid.center_location:
+        # Restore old center location if this edit could have moved it
+        if self.old_center_location is not _UNCHANGED:
             grid.center_location = self.old_center_location
         
         # Restore old state
@@ -62,10 +98,15 @@ class SetCellStateCommand(Command):
     
     def get_description(self) -> str:
         """Get description of the command."""
-        return f"Set cell ({self.row}, {self.col}) to {self.new_state.value}"
+        if self._desc is None:
+            self._desc = f"Set cell ({self.row}, {self.col}) to {self.new_state.value}"
+        return self._desc
 
 class CycleCellStateCommand(Command):
     """Command to cycle through cell states."""
+
+    __slots__ = ('row', 'col', 'old_state', 'old_value', 'new_state', 'new_value', 'old_center_location',
+                 'cycles', '_desc')
     
     def __init__(self, row: int, col: int):
         self.row = row
@@ -74,19 +115,25 @@ class CycleCellStateCommand(Command):
         self.old_value: Optional[int] = None
         self.new_state: Optional[CellState] = None
         self.new_value: Optional[int] = None
-        self.old_center_location: Optional[Tuple[int, int]] = None
+        self.old_center_location: Any = _UNCHANGED
+        self.cycles = 1  # Grows when consecutive cycles of this cell are merged
+        self._desc: Optional[str] = None  # Set in execute() once new_state is known
     
     def execute(self, grid) -> bool:
         """Execute the cell state cycle."""
         # Store old state
-        self.old_state, self.old_value = grid.get_cell_state(self.row, self.col)
-        self.old_center_location = grid.center_location
+        self.old_state, self.old_value = grid.cell_states.get((self.row, self.col), HOLE_ENTRY)
+        self.old_center_location = (grid.center_location
+                                    if grid.might_move_center(self.row, self.col)
+                                    else _UNCHANGED)
         
-        # Execute cycle
-        grid.cycle_cell_state(self.row, self.col)
+        # Execute cycle(s)
+        for _ in range(self.cycles):
+            grid.cycle_cell_state(self.row, self.col)
         
         # Store new state for description
-        self.new_state, self.new_value = grid.get_cell_state(self.row, self.col)
+        self.new_state, self.new_value = grid.cell_states.get((self.row, self.col), HOLE_ENTRY)
+        self._desc = f"Cycle cell ({self.row}, {self.col}) {self.old_state.value} → {self.new_state.value}"
         return True
     
     def undo(self, grid) -> bool:
@@ -94,8 +141,8 @@ class CycleCellStateCommand(Command):
         if self.old_state is None:
             return False
         
-        # Restore old center location if it was changed
-        if self.old_center_location != grid.center_location:
+        # Restore old center location if this edit could have moved it
+        if self.old_center_location is not _UNCHANGED:
             grid.center_location = self.old_center_location
         
         # Restore old state
@@ -104,10 +151,24 @@ class CycleCellStateCommand(Command):
     
     def get_description(self) -> str:
         """Get description of the command."""
-        return f"Cycle cell ({self.row}, {self.col}) {self.old_state.value} → {self.new_state.value}"
+        if self._desc is None:
+            self._desc = f"Cycle cell ({self.row}, {self.col}) {self.old_state.value} → {self.new_state.value}"
+        return self._desc
+    
+    def merge_id(self) -> Optional[Tuple]:
+        return ("cycle", self.row, self.col)
+    
+    def merge(self, other: Command) -> bool:
+        """Fold a later cycle of the same cell into this one."""
+        self.cycles += other.cycles
+        self.new_state, self.new_value = other.new_state, other.new_value
+        self._desc = None
+        return True
 
 class SetCellValueCommand(Command):
     """Command to set a numeric value in a cell."""
+
+    __slots__ = ('row', 'col', 'new_value', 'old_state', 'old_value', 'was_noop', '_desc')
     
     def __init__(self, row: int, col: int, value: int):
         self.row = row
@@ -115,11 +176,18 @@ class SetCellValueCommand(Command):
         self.new_value = value
         self.old_state: Optional[CellState] = None
         self.old_value: Optional[int] = None
+        self.was_noop = False
+        self._desc: Optional[str] = None  # Memoized get_description()
     
     def execute(self, grid) -> bool:
         """Execute the value setting."""
         # Store old state
-        self.old_state, self.old_value = grid.get_cell_state(self.row, self.col)
+        self.old_state, self.old_value = grid.cell_states.get((self.row, self.col), HOLE_ENTRY)
+        
+        # Cell already holds this value: report a no-op, don't mutate
+        self.was_noop = self.old_state == CellState.PREFILLED and self.old_value == self.new_value
+        if self.was_noop:
+            return False
         
         # Execute the change
         success = grid.set_cell_value(self.row, self.col, self.new_value)
@@ -136,15 +204,29 @@ class SetCellValueCommand(Command):
     
     def get_description(self) -> str:
         """Get description of the command."""
-        return f"Set value {self.new_value} at ({self.row}, {self.col})"
+        if self._desc is None:
+            self._desc = f"Set value {self.new_value} at ({self.row}, {self.col})"
+        return self._desc
+    
+    def merge_id(self) -> Optional[Tuple]:
+        return ("setvalue", self.row, self.col)
+    
+    def merge(self, other: Command) -> bool:
+        """Keep this command's old state; take the later value."""
+        self.new_value = other.new_value
+        self._desc = None
+        return True
 
 class AddDotConstraintCommand(Command):
     """Command to add a dot constraint between two cells."""
+
+    __slots__ = ('cell1', 'cell2', 'was_successful', '_desc')
     
     def __init__(self, cell1: Tuple[int, int], cell2: Tuple[int, int]):
         self.cell1 = cell1
         self.cell2 = cell2
         self.was_successful = False
+        self._desc: Optional[str] = None  # Memoized get_description()
     
     def execute(self, grid) -> bool:
         """Execute adding the constraint."""
@@ -160,15 +242,20 @@ class AddDotConstraintCommand(Command):
     
     def get_description(self) -> str:
         """Get description of the command."""
-        return f"Add constraint {self.cell1} ↔ {self.cell2}"
+        if self._desc is None:
+            self._desc = f"Add constraint {self.cell1} ↔ {self.cell2}"
+        return self._desc
 
 class RemoveDotConstraintCommand(Command):
     """Command to remove a dot constraint between two cells."""
+
+    __slots__ = ('cell1', 'cell2', 'was_removed', '_desc')
     
     def __init__(self, cell1: Tuple[int, int], cell2: Tuple[int, int]):
         self.cell1 = cell1
         self.cell2 = cell2
         self.was_removed = False
+        self._desc: Optional[str] = None  # Memoized get_description()
     
     def execute(self, grid) -> bool:
         """Execute removing the constraint."""
@@ -184,29 +271,161 @@ class RemoveDotConstraintCommand(Command):
     
     def get_description(self) -> str:
         """Get description of the command."""
-        return f"Remove constraint {self.cell1} ↔ {self.cell2}"
+        if self._desc is None:
+            self._desc = f"Remove constraint {self.cell1} ↔ {self.cell2}"
+        return self._desc
+
+class BulkAddDotConstraintsCommand(Command):
+    """Command to add many dot constraints in one grid update."""
+
+    __slots__ = ('pairs', 'added', 'was_noop')
+    
+    def __init__(self, pairs: List[Tuple[Tuple[int, int], Tuple[int, int]]]):
+        self.pairs = pairs
+        self.added: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+        self.was_noop = False
+    
+    def execute(self, grid) -> bool:
+        """Add every valid, not-yet-present constraint."""
+        self.added = grid.add_dot_constraints_bulk(self.pairs)
+        self.was_noop = not self.added
+        return not self.was_noop
+    
+    def undo(self, grid) -> bool:
+        """Remove exactly the constraints this command added."""
+        grid.remove_dot_constraints_bulk(self.added)
+        return True
+    
+    def get_description(self) -> str:
+        """Get description of the command."""
+        return f"Add {len(self.added or self.pairs)} constraints"
+
+class BulkSetStateCommand(Command):
+    """Command to set many cells to one state in a single grid update."""
+
+    __slots__ = ('cells', 'new_state', 'old_entries', 'old_center_location', 'was_noop', 'description')
+    
+    def __init__(self, cells: List[Tuple[int, int]], new_state: CellState, description: Optional[str] = None):
+        if new_state is CellState.CENTER:
+            raise ValueError("BulkSetStateCommand cannot place the center cell")
+        self.cells = cells
+        self.new_state = new_state
+        self.old_entries: Dict[Tuple[int, int], Tuple[CellState, Optional[int]]] = {}
+        self.old_center_location: Optional[Tuple[int, int]] = None
+        self.was_noop = False
+        self.description = description
+    
+    def execute(self, grid) -> bool:
+        """Write the new state to every cell not already in it."""
+        target = (self.new_state, None)
+        get = grid.cell_states.get
+        old_entries = {cell: get(cell, HOLE_ENTRY) for cell in self.cells}
+        self.old_entries = {cell: entry for cell, entry in old_entries.items() if entry != target}
+        self.was_noop = not self.old_entries
+        if self.was_noop:
+            return False
+        
+        self.old_center_location = grid.center_location
+        grid.set_cells_bulk(dict.fromkeys(self.old_entries, target))
+        return True
+    
+    def undo(self, grid) -> bool:
+        """Restore every changed cell in one update."""
+        if not self.old_entries:
+            return False
+        grid.set_cells_bulk(self.old_entries, center=self.old_center_location)
+        return True
+    
+    def get_description(self) -> str:
+        """Get description of the command."""
+        return self.description or f"Set {len(self.cells)} cells to {self.new_state.value}"
+
+class BulkSetValueCommand(Command):
+    """Command to set values in many cells in a single grid update; all-or-nothing."""
+
+    __slots__ = ('values', 'old_entries', 'old_center_location', 'was_noop', 'description')
+    
+    def __init__(self, cells: List[Tuple[int, int]], values: List[int], description: Optional[str] = None):
+        self.values = dict(zip(cells, values))
+        self.old_entries: Dict[Tuple[int, int], Tuple[CellState, Optional[int]]] = {}
+        self.old_center_location: Optional[Tuple[int, int]] = None
+        self.was_noop = False
+        self.description = description
+    
+    def execute(self, grid) -> bool:
+        """Write every value that differs from the cell's current one."""
+        get = grid.cell_states.get
+        prefilled = CellState.PREFILLED
+        changed = {cell: value for cell, value in self.values.items()
+                   if get(cell, HOLE_ENTRY) != (prefilled, value)}
+        self.was_noop = not changed
+        if self.was_noop:
+            self.old_entries = {}
+            return False
+        
+        self.old_entries = {cell: get(cell, HOLE_ENTRY) for cell in changed}
+        self.old_center_location = grid.center_location
+        if not grid.set_cell_values_bulk(changed):
+            self.old_entries = {}
+            return False
+        return True
+    
+    def undo(self, grid) -> bool:
+        """Restore every changed cell in one update."""
+        if not self.old_entries:
+            return False
+        grid.set_cells_bulk(self.old_entries, center=self.old_center_location)
+        return True
+    
+    def get_description(self) -> str:
+        """Get description of the command."""
+        return self.description or f"Set values in {len(self.values)} cells"
 
 class BatchCommand(Command):
     """Command that groups multiple commands into a single undo/redo unit."""
+
+    __slots__ = ('commands', 'description', 'executed_commands', 'was_noop')
     
     def __init__(self, commands: List[Command], description: str):
         self.commands = commands
         self.description = description
         self.executed_commands: List[Command] = []
+        self.was_noop = False
+    
+    @classmethod
+    def make(cls, commands: List[Command], description: str) -> Command:
+        """Build a batch, or return the lone command itself when there is only one."""
+        if len(commands) == 1:
+            return commands[0]
+        return cls(commands, description)
     
     def execute(self, grid) -> bool:
-        """Execute all commands in sequence."""
+        """Execute all commands in sequence; all-or-nothing. No-op children are skipped."""
         self.executed_commands.clear()
+        self.was_noop = False
+        checkpoint = grid.snapshot_state()
         
-        for command in self.commands:
-            if command.execute(grid):
-                self.executed_commands.append(command)
-            else:
-                # If any command fails, undo all successful ones
-                for executed_command in reversed(self.executed_commands):
-                    executed_command.undo(grid)
-                return False
+        try:
+            for command in self.commands:
+                if command.execute(grid):
+                    self.executed_commands.append(command)
+                elif command.was_noop:
+                    continue
+                else:
+                    # If any command fails, roll the grid back in one step
+                    grid.restore_state(checkpoint)
+                    self.executed_commands.clear()
+                    return False
+        except Exception:
+            grid.restore_state(checkpoint)
+            self.executed_commands.clear()
+            raise
         
+        grid.release_state(checkpoint)
+        if not self.executed_commands:
+            # Every child was a no-op; keep the batch out of history
+            self.was_noop = bool(self.commands)
+            return False
         return True
     
     def undo(self, grid) -> bool:
@@ -226,14 +445,16 @@ class LiveBatchCommand(Command):
     """
     A batch that executes each child command immediately (so the board updates
     after every input), but is committed to history as a *single* undo/redo step.
-    First call to execute() (when added to history) is a no-op commit;
-    on redo, execute() replays all child commands.
+    Commit it with CommandHistory.record_executed() (children are already
+    applied); execute() replays all child commands and is used for redo.
     """
+
+    __slots__ = ('description', 'commands', 'executed_commands')
+
     def __init__(self, description: str):
         self.description = description
         self.commands: List[Command] = []
         self.executed_commands: List[Command] = []
-        self._committed = False  # set True once added to history
 
     def add_and_execute(self, grid, command: Command) -> bool:
         """Execute now (updates board immediately) and stage for single-step undo."""
@@ -241,6 +462,8 @@ class LiveBatchCommand(Command):
             self.commands.append(command)
             self.executed_commands.append(command)
             return True
+        if command.was_noop:
+            return True  # Nothing changed; nothing to stage
         # If a command fails, roll back any executed so far in this live batch
         for done in reversed(self.executed_commands):
             done.undo(grid)
@@ -249,16 +472,7 @@ class LiveBatchCommand(Command):
         return False
 
     def execute(self, grid) -> bool:
-        """
-        Commit to history. If not yet committed, do *not* re-execute (already applied).
-        On redo (after an undo), replay all commands.
-        """
-        if not self._committed:
-            # First time added to history: mark committed; commands already applied.
-            self._committed = True
-            return True
-
-        # Redo path: re-apply all commands
+        """Replay all child commands (redo path)."""
         self.executed_commands.clear()
         for cmd in self.commands:
             if cmd.execute(grid):
@@ -283,151 +497,299 @@ class LiveBatchCommand(Command):
     def get_description(self) -> str:
         return self.description
 
+class ResetGridCommand(Command):
+    """Command to clear every cell to EMPTY and drop all constraints.
+
+    Like ImportPuzzleCommand, it swaps the grid's containers instead of
+    recording per-cell changes: execute installs fresh empty ones and
+    keeps the old objects, undo rebinds them.
+    """
+
+    __slots__ = ('_saved', 'was_noop')
+    
+    def __init__(self):
+        # (cell_states, dot_constraints, center_location) detached by execute()
+        self._saved: Optional[Tuple] = None
+        self.was_noop = False
+    
+    def execute(self, grid) -> bool:
+        """Replace the grid contents with an all-EMPTY, constraint-free grid."""
+        self.was_noop = (not grid.dot_constraints
+                         and grid._state_counts[CellState.EMPTY] == len(grid.cell_states))
+        if self.was_noop:
+            return False
+        
+        self._saved = (grid.cell_states, grid.dot_constraints, grid.center_location)
+        grid._initialize_empty_grid()
+        grid.dot_constraints = set()
+        grid.center_location = None
+        grid._changed()
+        return True
+    
+    def undo(self, grid) -> bool:
+        """Rebind the cells and constraints detached by execute()."""
+        if self._saved is None:
+            return False
+        
+        grid.cell_states, grid.dot_constraints, grid.center_location = self._saved
+        self._saved = None
+        grid._rebuild_indexes()
+        grid._changed()
+        return True
+    
+    def get_description(self) -> str:
+        """Get description of the command."""
+        return "Clear grid"
+
 class ImportPuzzleCommand(Command):
-    """Command to import a complete puzzle (batch operation)."""
+    """Command to import a complete puzzle (batch operation).
+
+    The JSON is parsed once. Execute and undo rebind the grid's state
+    containers (cell_states, dot_constraints, loaded adjacency) between
+    the pre-import objects and the parsed ones instead of copying them;
+    history is linear, so whichever set is detached is back in its
+    original state by the time it is rebound.
+    """
+
+    __slots__ = ('json_data', '_old_snapshot', '_new_snapshot', '_desc')
     
     def __init__(self, json_data: Dict):
-        self.json_data = json_data
-        self.old_grid_data: Optional[Dict] = None
+        self.json_data: Optional[Dict] = json_data  # Released after the first parse
+        # (rows, cols, cell_states, dot_constraints, center_location, loaded_adjacency)
+        self._old_snapshot: Optional[Tuple] = None  # Grid state before the import
+        self._new_snapshot: Optional[Tuple] = None  # Parsed puzzle
+        self._desc: Optional[str] = None  # Memoized get_description()
+    
+    @staticmethod
+    def _capture(grid) -> Tuple:
+        return (grid.rows, grid.cols, grid.cell_states, grid.dot_constraints,
+                grid.center_location, getattr(grid, 'loaded_adjacency', None))
+    
+    @staticmethod
+    def _rebind(grid, snapshot: Tuple) -> None:
+        (grid.rows, grid.cols, grid.cell_states, grid.dot_constraints,
+         grid.center_location, grid.loaded_adjacency) = snapshot
+        grid._rebuild_indexes()
+        grid._changed()
     
     def execute(self, grid) -> bool:
         """Execute the puzzle import."""
-        # Store old grid state
-        self.old_grid_data = grid.to_json("backup")
+        if self._new_snapshot is None:
+            try:
+                # Import the new puzzle data
+                new_grid = grid.__class__.from_json(self.json_data)
+            except Exception:
+                return False
+            # new_grid is discarded, so its containers can be adopted as-is
+            self._new_snapshot = self._capture(new_grid)
+            # Parsed state replaces the raw JSON; keep only the description
+            self.get_description()
+            self.json_data = None
         
-        # Clear current grid and import new data
-        try:
-            # Import the new puzzle data
-            new_grid = grid.__class__.from_json(self.json_data)
-            
-            # Copy all state from new grid to current grid
-            grid.rows = new_grid.rows
-            grid.cols = new_grid.cols
-            grid.cell_states = new_grid.cell_states.copy()
-            grid.dot_constraints = new_grid.dot_constraints.copy()
-            grid.center_location = new_grid.center_location
-
-            # Preserve loaded adjacency (Phase-1 fidelity)
-            grid.loaded_adjacency = getattr(new_grid, 'loaded_adjacency', None)
-            
-            return True
-        except Exception:
-            return False
+        self._old_snapshot = self._capture(grid)
+        self._rebind(grid, self._new_snapshot)
+        return True
     
     def undo(self, grid) -> bool:
-        """Undo the puzzle import."""
-        if self.old_grid_data is None:
+        """Undo the puzzle import by rebinding the pre-import state."""
+        if self._old_snapshot is None:
             return False
         
-        try:
-            # Restore old grid state
-            old_grid = grid.__class__.from_json(self.old_grid_data)
-            
-            grid.rows = old_grid.rows
-            grid.cols = old_grid.cols
-            grid.cell_states = old_grid.cell_states.copy()
-            grid.dot_constraints = old_grid.dot_constraints.copy()
-            grid.center_location = old_grid.center_location
-
-            # Restore loaded adjacency on undo
-            grid.loaded_adjacency = getattr(old_grid, 'loaded_adjacency', None)
-            
-            return True
-        except Exception:
-            return False
+        self._rebind(grid, self._old_snapshot)
+        return True
     
     def get_description(self) -> str:
         """Get description of the import operation."""
-        puzzle_id = self.json_data.get("id", "unknown")
-        return f"Import puzzle '{puzzle_id}'"
+        if self._desc is None:
+            puzzle_id = self.json_data.get("id", "unknown")
+            self._desc = f"Import puzzle '{puzzle_id}'"
+        return self._desc
 
 class CommandHistory:
-    """Manages command history for undo/redo operations."""
+    """Manages command history for undo/redo operations.
+
+    Two stacks: ``_undo`` holds executed commands (oldest evicted once
+    ``max_history`` is reached) and ``_redo`` holds undone ones; any new
+    command clears ``_redo``. When psutil is available and free system
+    memory drops below ``LOW_MEMORY_BYTES``, the oldest entries are
+    trimmed further, down to ``MIN_HISTORY``. Memory is sampled at most
+    once per ``MEMORY_CHECK_INTERVAL_S``.
+    """
+
+    __slots__ = ('max_history', '_undo', '_redo', 'trimmed_count', '_last_push', 'version',
+                 '_next_memory_check')
+
+    LOW_MEMORY_BYTES = 256 * 1024 * 1024
+    MIN_HISTORY = 30
+    # psutil.virtual_memory() reads /proc/meminfo; don't do that on every click
+    MEMORY_CHECK_INTERVAL_S = 5.0
+    # Consecutive commands with equal merge_id() within this window become one entry
+    MERGE_WINDOW_S = 0.5
     
     def __init__(self, max_history: int = 100):
         self.max_history = max_history
-        self.history: List[Command] = []
-        self.current_index = -1  # Points to last executed command
+        self._undo: deque = deque(maxlen=max_history)  # Executed commands, newest last
+        self._redo: deque = deque()  # Undone commands, next to redo last
+        self.trimmed_count = 0  # Oldest commands dropped since last clear
+        self._last_push: Optional[float] = None  # monotonic time of last push; None disables merging
+        self.version = 0  # Bumped whenever counts or descriptions may have changed
+        self._next_memory_check = 0.0  # monotonic time before which _maybe_trim() skips sampling
     
     def execute_command(self, command: Command, grid) -> bool:
         """Execute a command and add it to history."""
         success = command.execute(grid)
         
         if success:
-            # Remove any commands after current index (if we're in middle of history)
-            if self.current_index < len(self.history) - 1:
-                self.history = self.history[:self.current_index + 1]
-            
-            # Add new command
-            self.history.append(command)
-            self.current_index += 1
-            
-            # Limit history size
-            if len(self.history) > self.max_history:
-                self.history.pop(0)
-                self.current_index -= 1
+            self._push(command)
         
         return success
     
+    def record_executed(self, command: Command) -> None:
+        """Add a command whose effect is already applied (e.g. a LiveBatchCommand) without executing it."""
+        self._push(command)
+    
+    def _push(self, command: Command, clear_redo: bool = True) -> None:
+        """
+        Record an executed command: merge it into the last entry or append it.
+        
+        clear_redo=False is for callers that know the redo branch is empty.
+        """
+        now = time.monotonic()
+        
+        # Fold rapid repeat edits of the same target into the previous entry
+        if (self._undo and not self._redo and self._last_push is not None
+                and now - self._last_push < self.MERGE_WINDOW_S):
+            key = command.merge_id()
+            last = self._undo[-1]
+            if key is not None and key == last.merge_id() and last.merge(command):
+                self._last_push = now
+                self.version += 1
+                return
+        self._last_push = now
+        
+        # A new command invalidates the redo branch
+        if clear_redo:
+            self._redo.clear()
+        
+        # Full deque evicts the oldest command on append
+        if len(self._undo) == self.max_history:
+            self.trimmed_count += 1
+        self._undo.append(command)
+        self.version += 1
+        
+        self._maybe_trim()
+    
+    def quick_push(self, command: Command, grid) -> bool:
+        """
+        Fast path of execute_command() for single-cell edits.
+        
+        With an empty redo branch (the usual case while editing) there is
+        nothing to clear, so the command is executed and recorded without
+        touching it. Otherwise defers to execute_command().
+        """
+        if self._redo:
+            return self.execute_command(command, grid)
+        if not command.execute(grid):
+            return False
+        self._push(command, clear_redo=False)
+        return True
+    
+    def _maybe_trim(self):
+        """Drop oldest commands down to MIN_HISTORY when memory is tight."""
+        if psutil is None or len(self._undo) <= self.MIN_HISTORY:
+            return
+        now = time.monotonic()
+        if now < self._next_memory_check:
+            return
+        self._next_memory_check = now + self.MEMORY_CHECK_INTERVAL_S
+        try:
+            available = psutil.virtual_memory().available
+        except Exception:
+            return
+        if available >= self.LOW_MEMORY_BYTES:
+            return
+        
+        excess = len(self._undo) - self.MIN_HISTORY
+        for _ in range(excess):
+            self._undo.popleft()
+        self.trimmed_count += excess
+        self.version += 1
+    
     def can_undo(self) -> bool:
         """Check if undo is possible."""
-        return self.current_index >= 0
+        return bool(self._undo)
     
     def can_redo(self) -> bool:
         """Check if redo is possible."""
-        return self.current_index < len(self.history) - 1
+        return bool(self._redo)
     
     def undo(self, grid) -> bool:
         """Undo the last command."""
-        if not self.can_undo():
+        if not self._undo:
             return False
         
-        command = self.history[self.current_index]
+        command = self._undo[-1]
         success = command.undo(grid)
         
         if success:
-            self.current_index -= 1
+            self._redo.append(self._undo.pop())
+            self._last_push = None
+            self.version += 1
         
         return success
     
     def redo(self, grid) -> bool:
         """Redo the next command."""
-        if not self.can_redo():
+        if not self._redo:
             return False
         
-        self.current_index += 1
-        command = self.history[self.current_index]
+        command = self._redo[-1]
         success = command.execute(grid)
         
-        if not success:
-            self.current_index -= 1
+        if success:
+            self._undo.append(self._redo.pop())
+            self._last_push = None
+            self.version += 1
         
         return success
     
     def get_undo_description(self) -> Optional[str]:
         """Get description of command that would be undone."""
-        if not self.can_undo():
+        if not self._undo:
             return None
-        return self.history[self.current_index].get_description()
+        return self._undo[-1].get_description()
     
     def get_redo_description(self) -> Optional[str]:
         """Get description of command that would be redone."""
-        if not self.can_redo():
+        if not self._redo:
             return None
-        return self.history[self.current_index + 1].get_description()
+        return self._redo[-1].get_description()
     
     def clear_history(self):
         """Clear all command history."""
-        self.history.clear()
-        self.current_index = -1
+        self._undo.clear()
+        self._redo.clear()
+        self.trimmed_count = 0
+        self._last_push = None
+        self.version += 1
+    
+    def get_counts(self) -> Tuple[int, int, bool, bool]:
+        """Cheap history state: (total_commands, current_index, can_undo, can_redo)."""
+        undo_len = len(self._undo)
+        return (undo_len + len(self._redo), undo_len - 1, undo_len > 0, bool(self._redo))
+    
+    def get_names(self) -> Tuple[Optional[str], Optional[str]]:
+        """Descriptions of the commands that undo/redo would act on."""
+        return (self.get_undo_description(), self.get_redo_description())
     
     def get_history_info(self) -> Dict[str, Any]:
         """Get information about current history state."""
         return {
-            "total_commands": len(self.history),
-            "current_index": self.current_index,
+            "total_commands": len(self._undo) + len(self._redo),
+            "current_index": len(self._undo) - 1,
             "can_undo": self.can_undo(),
             "can_redo": self.can_redo(),
             "undo_description": self.get_undo_description(),
-            "redo_description": self.get_redo_description()
-        }
\ No newline at end of file
+            "redo_description": self.get_redo_description(),
+            "trimmed_commands": self.trimmed_count
+        }
@@ -3,20 +3,34 @@ Advanced constraint management for Rikudo Puzzle Creator Phase 4.
 Enhanced visual guides, validation, and batch operations for constraints.
 """
 from typing import Set, Tuple, List, Dict, Optional, Any, Callable
+from collections import defaultdict
+from functools import partial
 from enum import Enum
 from dataclasses import dataclass
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 
 from core.hex_grid import HexGrid
-from core.types import CellState, ValidationError
-from core.commands import Command, BatchCommand, AddDotConstraintCommand, RemoveDotConstraintCommand
+from core.types import CellState, ValidationError, HOLE_ENTRY
+from core.commands import Command, BatchCommand, RemoveDotConstraintCommand
 
 from core.commands import (
-    Command, BatchCommand, SetCellStateCommand, SetCellValueCommand,
-    AddDotConstraintCommand, RemoveDotConstraintCommand, LiveBatchCommand
+    Command, BatchCommand, SetCellValueCommand,
+    RemoveDotConstraintCommand, LiveBatchCommand,
+    BulkAddDotConstraintsCommand, BulkSetStateCommand, BulkSetValueCommand
 )
 
+# Hot-path state groups. Tuples rather than frozensets: CellState hashing runs
+# Enum.__hash__ in Python, while tuple membership short-circuits on identity.
+_PLAYABLE_STATES = (CellState.EMPTY, CellState.PREFILLED)
+_SELECTABLE_STATES = _PLAYABLE_STATES + (CellState.NONPLAYABLE,)
+
+
+def _sorted_by_position(cells, cols: int) -> List[Tuple[int, int]]:
+    """Cells in row-major order; sorts packed int keys instead of comparing tuples."""
+    return [divmod(key, cols) for key in sorted([row * cols + col for row, col in cells])]
+
+
 class ConstraintType(Enum):
     """Types of constraints supported."""
     DOT = "dot"                    # Current dot constraints
@@ -24,7 +38,7 @@ class ConstraintType(Enum):
     DISTANCE = "distance"          # Future: minimum distance between numbers
     EXCLUSION = "exclusion"        # Future: cells that can't be adjacent
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConstraintConflict:
     """Represents a conflict between constraints."""
     type: str
@@ -37,6 +51,58 @@ class ConstraintValidator:
     
     def __init__(self, grid: HexGrid):
         self.grid = grid
+        # Memoized constraint adjacency (see _constraint_graph), keyed by grid.revision
+        self._graph_cache: Tuple[Optional[Dict], int] = (None, -1)
+        # Neighbor frozensets (see neighbors()); dropped when grid.revision changes
+        self._nbr_cache: Dict[Tuple[int, int], frozenset] = {}
+        self._nbr_cache_rev = -1
+        # Adjacent playable pairs (see playable_edge_count), keyed by grid.revision
+        self._edge_cache: Tuple[int, int] = (0, -1)
+    
+    def neighbors(self, cell: Tuple[int, int]) -> frozenset:
+        """Cached neighbors of a cell (neighbors only change with grid edits)."""
+        if self._nbr_cache_rev != self.grid.revision:
+            self._nbr_cache.clear()
+            self._nbr_cache_rev = self.grid.revision
+        nbrs = self._nbr_cache.get(cell)
+        if nbrs is None:
+            nbrs = frozenset(self.grid.get_neighbors(*cell))
+            self._nbr_cache[cell] = nbrs
+        return nbrs
+    
+    def playable_edge_count(self) -> int:
+        """Number of adjacent playable cell pairs, i.e. how many dots could be placed."""
+        count, revision = self._edge_cache
+        if revision != self.grid.revision:
+            playable = self.grid.get_playable_cells_set()
+            pairs = {(cell, other) if cell < other else (other, cell)
+                     for cell in playable for other in self.neighbors(cell) & playable}
+            count = len(pairs)
+            self._edge_cache = (count, self.grid.revision)
+        return count
+    
+    def _constraint_graph(self) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
+        """Cell -> constrained partners, rebuilt only when grid.revision changes."""
+        graph, revision = self._graph_cache
+        if graph is None or revision != self.grid.revision:
+            graph = defaultdict(list)
+            for cell1, cell2 in self.grid.dot_constraints:
+                graph[cell1].append(cell2)
+                graph[cell2].append(cell1)
+            self._graph_cache = (graph, self.grid.revision)
+        return graph
+    
+    def is_valid_pair(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> bool:
+        """
+        True if validate_constraint_placement() would report no errors.
+        
+        Allocation-free check for bulk filtering; use validate_constraint_placement()
+        when messages are needed.
+        """
+        cell_states = self.grid.cell_states
+        return (cell_states.get(cell1, HOLE_ENTRY)[0] in _PLAYABLE_STATES and
+                cell_states.get(cell2, HOLE_ENTRY)[0] in _PLAYABLE_STATES and
+                cell2 in self.neighbors(cell1))
     
     def validate_constraint_placement(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> List[ValidationError]:
         """Validate a single constraint placement with detailed analysis."""
@@ -50,8 +116,7 @@ class ConstraintValidator:
             return errors
         
         # Adjacency check
-        neighbors = self.grid.get_neighbors(r1, c1)
-        if (r2, c2) not in neighbors:
+        if cell2 not in self.neighbors(cell1):
             errors.append(ValidationError("error", "Cells are not adjacent", location=cell1))
             return errors
         
@@ -59,10 +124,10 @@ class ConstraintValidator:
         state1, value1 = self.grid.get_cell_state(r1, c1)
         state2, value2 = self.grid.get_cell_state(r2, c2)
         
-        if state1 not in (CellState.EMPTY, CellState.PREFILLED):
+        if state1 not in _PLAYABLE_STATES:
             errors.append(ValidationError("error", f"Cell {cell1} is not playable", location=cell1))
         
-        if state2 not in (CellState.EMPTY, CellState.PREFILLED):
+        if state2 not in _PLAYABLE_STATES:
             errors.append(ValidationError("error", f"Cell {cell2} is not playable", location=cell2))
         
         # Advanced validation: Check for logical conflicts
@@ -81,13 +146,9 @@ class ConstraintValidator:
         conflicts = []
         
         # Check for overconstrained cells (cells with too many constraints)
-        constraint_count = {}
-        for (cell1, cell2) in self.grid.dot_constraints:
-            constraint_count[cell1] = constraint_count.get(cell1, 0) + 1
-            constraint_count[cell2] = constraint_count.get(cell2, 0) + 1
-        
         # Cells with more than 2 constraints might be problematic
-        for cell, count in constraint_count.items():
+        for cell, partners in self._constraint_graph().items():
+            count = len(partners)
             if count > 2:
                 conflicts.append(ConstraintConflict(
                     type="overconstrained",
@@ -105,50 +166,41 @@ class ConstraintValidator:
         """Detect constraint chains that create impossible sequences."""
         conflicts = []
         
-        # Build constraint graph
-        constraint_graph = {}
-        for (cell1, cell2) in self.grid.dot_constraints:
-            if cell1 not in constraint_graph:
-                constraint_graph[cell1] = []
-            if cell2 not in constraint_graph:
-                constraint_graph[cell2] = []
-            constraint_graph[cell1].append(cell2)
-            constraint_graph[cell2].append(cell1)
+        # Union-find over the constraint edges: component sizes in one pass
+        parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        size: Dict[Tuple[int, int], int] = {}
         
-        # Look for chains longer than the available sequence space
-        visited = set()
-        for start_cell in constraint_graph:
-            if start_cell in visited:
+        def find(cell):
+            root = parent.setdefault(cell, cell)
+            while root != parent[root]:
+                parent[root] = parent[parent[root]]  # Path halving
+                root = parent[root]
+            return root
+        
+        for cell1, cell2 in self.grid.dot_constraints:
+            root1, root2 = find(cell1), find(cell2)
+            if root1 == root2:
                 continue
-            
-            chain_length = self._get_constraint_chain_length(start_cell, constraint_graph, visited)
-            playable_cells = len(self.grid.get_playable_cells())
-            
+            size1, size2 = size.get(root1, 1), size.get(root2, 1)
+            if size1 < size2:
+                root1, root2 = root2, root1
+            parent[root2] = root1
+            size[root1] = size1 + size2
+        
+        # Look for chains longer than the available sequence space
+        playable_cells = self.grid.get_playable_count()
+        for root, chain_length in size.items():
+            if parent[root] != root:
+                continue  # Merged into another component
             if chain_length > playable_cells:
                 conflicts.append(ConstraintConflict(
                     type="impossible_chain",
-                    location=(start_cell, start_cell),
+                    location=(root, root),
                     message=f"Constraint chain of length {chain_length} exceeds grid size {playable_cells}",
                     severity="error"
                 ))
         
         return conflicts
-    
-    def _get_constraint_chain_length(self, start_cell: Tuple[int, int], 
-                                   constraint_graph: Dict, visited: Set) -> int:
-        """Get the length of a constraint chain starting from a cell."""
-        if start_cell in visited:
-            return 0
-        
-        visited.add(start_cell)
-        max_length = 1
-        
-        for neighbor in constraint_graph.get(start_cell, []):
-            if neighbor not in visited:
-                length = 1 + self._get_constraint_chain_length(neighbor, constraint_graph, visited)
-                max_length = max(max_length, length)
-        
-        return max_length
 
 class ConstraintEditor:
     """Enhanced constraint editing with visual guides and batch operations."""
@@ -160,12 +212,24 @@ class ConstraintEditor:
         
         # Visual state
         self.preview_items = []
-        self.guide_items = []
+        # Selection guide canvas items: highlight per selected cell, line per
+        # canonical pair; _guides_rev is the grid.revision they were drawn for
+        self._hl_by_cell: Dict[Tuple[int, int], int] = {}
+        self._line_by_pair: Dict[Tuple[Tuple[int, int], Tuple[int, int]], int] = {}
+        self._guides_rev = -1
+        # Selection ops mark guides dirty; one sync runs per Tk idle tick
+        self._guides_dirty = False
+        self._guides_scheduled = False
         self.selection_mode = False
         self.selected_cells: Set[Tuple[int, int]] = set()
         
+        # Optional non-modal sink for informational results (e.g. a status bar);
+        # without one they are shown in a message box
+        self.status_sink: Optional[Callable[[str], None]] = None
+        
         # NEW: Track the order cells were selected for numbering
-        self.selection_order: List[Tuple[int, int]] = []
+        # (dict used as an insertion-ordered set: O(1) removal)
+        self.selection_order: Dict[Tuple[int, int], None] = {}
         
         # Batch operation state
         self.batch_operations: List[Command] = []
@@ -173,6 +237,18 @@ class ConstraintEditor:
         # Current-numbering highlight
         self.current_prompt_items: List[int] = []
 
+        # Selection version (bumped by _selection_changed) and the pair list
+        # computed for it by selection_pairs(), keyed by (version, grid.revision)
+        self._sel_ver = 0
+        self._pairs_cache: Tuple[Optional[List], Tuple[int, int]] = (None, (-1, -1))
+        # Selected cells bucketed by state (see _classify_selection), same key
+        self._class_cache: Tuple[Optional[Dict], Tuple[int, int]] = (None, (-1, -1))
+        # get_constraint_analysis() result for the grid.revision it was computed at
+        self._analysis_cache: Tuple[Optional[Dict[str, Any]], int] = (None, -1)
+        # Batch operation menus by (has playable, has prefilled, has blocked)
+        self._ops_cache: Dict[Tuple[bool, bool, bool], Dict[str, Callable]] = {}
+
+
     # ---------- dialog helpers to keep prompts always on top ----------
     def _dialog_parent(self):
         """Return the toplevel window to parent dialogs; None if unavailable."""
@@ -181,16 +257,31 @@ class ConstraintEditor:
         except Exception:
             return None
 
-    def _askinteger_topmost(self, title, prompt, **kwargs):
+    @staticmethod
+    def _set_topmost(parent, on: bool):
+        """Raise/pin (or unpin) the dialog parent; ignores Tk errors."""
+        if parent is None:
+            return
+        try:
+            if on:
+                parent.lift()
+            parent.attributes("-topmost", on)
+        except Exception:
+            pass
+
+    def _askinteger_topmost(self, title, prompt, parent=None, pinned=False, **kwargs):
         """
         Integer prompt that:
           - stays on top,
           - focuses the entry and selects all text,
           - submits on Enter, cancels on Esc,
           - enforces minvalue/maxvalue if provided.
-        Drop-in replacement for simpledialog.askinteger.
+        Drop-in replacement for simpledialog.askinteger. Pass a resolved
+        parent (and pinned=True if the caller already keeps it topmost) to
+        skip the per-prompt lookup and topmost toggling in prompt loops.
         """
-        parent = self._dialog_parent()
+        if parent is None:
+            parent = self._dialog_parent()
         minv = kwargs.get("minvalue", None)
         maxv = kwargs.get("maxvalue", None)
         initial = kwargs.get("initialvalue", 1)
@@ -204,11 +295,8 @@ class ConstraintEditor:
         top = tk.Toplevel(parent)
         top.title(title)
         top.transient(parent)
-        try:
-            parent.lift()
-            parent.attributes("-topmost", True)
-        except Exception:
-            pass
+        if not pinned:
+            self._set_topmost(parent, True)
 
         # --- Layout ---
         frm = tk.Frame(top, padx=12, pady=10)
@@ -267,38 +355,39 @@ class ConstraintEditor:
         parent.wait_window(top)
 
         # Restore parent's topmost
-        try:
-            parent.attributes("-topmost", False)
-        except Exception:
-            pass
+        if not pinned:
+            self._set_topmost(parent, False)
 
         return result["value"]
 
-    def _askyesnocancel_topmost(self, title, prompt):
+    def _askyesnocancel_topmost(self, title, prompt, parent=None, pinned=False):
         """askyesnocancel that stays on top and is parented to the main window."""
-        parent = self._dialog_parent()
+        if parent is None:
+            parent = self._dialog_parent()
         if parent is not None:
+            if pinned:
+                return messagebox.askyesnocancel(title, prompt, parent=parent)
             try:
-                parent.lift(); parent.attributes('-topmost', True); parent.update_idletasks()
+                self._set_topmost(parent, True)
+                parent.update_idletasks()
                 return messagebox.askyesnocancel(title, prompt, parent=parent)
             finally:
-                try:
-                    parent.attributes('-topmost', False)
-                except Exception:
-                    pass
+                self._set_topmost(parent, False)
         return messagebox.askyesnocancel(title, prompt)
     
     def enter_selection_mode(self):
         """Enter batch selection mode for constraint operations."""
         self.selection_mode = True
         self.selected_cells.clear()
+        self._selection_changed()
         self.selection_order.clear()  # Clear order tracking
-        self._update_visual_guides()
+        self._request_redraw()
     
     def exit_selection_mode(self):
         """Exit batch selection mode."""
         self.selection_mode = False
         self.selected_cells.clear()
+        self._selection_changed()
         self.selection_order.clear()  # Clear order tracking
         self._clear_visual_guides()
         self._clear_current_number_highlight()
@@ -335,27 +424,45 @@ class ConstraintEditor:
         if cell in self.selected_cells:
             # Remove from selection
             self.selected_cells.remove(cell)
-            if cell in self.selection_order:
-                self.selection_order.remove(cell)
+            self._selection_changed()
+            self.selection_order.pop(cell, None)
         else:
             # Add to selection
             # Only allow playable cells to be selected
             state, _ = self.grid.get_cell_state(row, col)
-            if state in (CellState.EMPTY, CellState.PREFILLED, CellState.NONPLAYABLE):  # Allow blocked cells too
+            if state in _SELECTABLE_STATES:  # Allow blocked cells too
                 self.selected_cells.add(cell)
-                self.selection_order.append(cell)  # Track order
+                self._selection_changed()
+                self.selection_order[cell] = None  # Track order
         
-        self._update_visual_guides()
+        self._update_guides_for_cell(cell)
         return True
     
+    def _nbrs(self, cell: Tuple[int, int]) -> frozenset:
+        """Cached neighbors of a cell (shared with the validator)."""
+        return self.validator.neighbors(cell)
+    
+    def _selection_changed(self):
+        """Invalidate selection-derived caches; call after any change to selected_cells."""
+        self._sel_ver += 1
+    
+    def selection_pairs(self) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """get_possible_constraints(selected_cells), cached until the selection or grid changes."""
+        pairs, key = self._pairs_cache
+        current = (self._sel_ver, self.grid.revision)
+        if pairs is None or key != current:
+            pairs = self.get_possible_constraints(self.selected_cells)
+            self._pairs_cache = (pairs, current)
+        return pairs
+    
     def get_possible_constraints(self, selected_cells: Set[Tuple[int, int]]) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
         """Get all possible constraint pairs from selected cells."""
         possible_constraints = []
         
         for cell1 in selected_cells:
-            neighbors = self.grid.get_neighbors(*cell1)
-            for neighbor in neighbors:
-                if neighbor in selected_cells and cell1 < neighbor:  # Avoid duplicates
+            # Intersect in C, then order-compare only the selected neighbors
+            for neighbor in self._nbrs(cell1) & selected_cells:
+                if cell1 < neighbor:  # Avoid duplicates
                     possible_constraints.append((cell1, neighbor))
         
         return possible_constraints
@@ -365,35 +472,31 @@ class ConstraintEditor:
         if not self.selection_mode or len(self.selected_cells) < 2:
             return False
         
-        possible_constraints = self.get_possible_constraints(self.selected_cells)
+        possible_constraints = self.selection_pairs()
         
         if not possible_constraints:
             messagebox.showwarning("No Constraints", "No valid constraint pairs found in selection.")
             return False
         
         # Validate all constraints first
-        valid_constraints = []
-        for cell1, cell2 in possible_constraints:
-            errors = self.validator.validate_constraint_placement(cell1, cell2)
-            if not any(e.severity == "error" for e in errors):
-                valid_constraints.append((cell1, cell2))
+        is_valid_pair = self.validator.is_valid_pair
+        valid_constraints = [pair for pair in possible_constraints if is_valid_pair(*pair)]
         
         if not valid_constraints:
             messagebox.showwarning("Invalid Constraints", "No valid constraints can be created from selection.")
             return False
         
-        # Create batch command
-        commands = []
-        for cell1, cell2 in valid_constraints:
-            if not self.grid.has_dot_constraint(cell1, cell2):
-                commands.append(AddDotConstraintCommand(cell1, cell2))
+        # Single bulk command (one grid update) for all missing constraints;
+        # selection pairs are already canonical, so test the set directly
+        existing = self.grid.dot_constraints
+        new_pairs = [pair for pair in valid_constraints if pair not in existing]
         
-        if commands:
-            batch_command = BatchCommand(commands, f"Add {len(commands)} constraints")
-            success = self.grid.command_history.execute_command(batch_command, self.grid)
+        if new_pairs:
+            bulk_command = BulkAddDotConstraintsCommand(new_pairs)
+            success = self.grid.command_history.execute_command(bulk_command, self.grid)
             
             if success:
-                messagebox.showinfo("Constraints Added", f"Added {len(commands)} constraints successfully.")
+                messagebox.showinfo("Constraints Added", f"Added {len(bulk_command.added)} constraints successfully.")
                 self.exit_selection_mode()
                 return True
         
@@ -404,19 +507,20 @@ class ConstraintEditor:
         if not self.selection_mode or len(self.selected_cells) < 2:
             return False
         
-        possible_constraints = self.get_possible_constraints(self.selected_cells)
+        possible_constraints = self.selection_pairs()
         
         # Find existing constraints to remove
         commands = []
+        existing = self.grid.dot_constraints
         for cell1, cell2 in possible_constraints:
-            if self.grid.has_dot_constraint(cell1, cell2):
+            if (cell1, cell2) in existing:  # Pairs are canonical (cell1 < cell2)
                 commands.append(RemoveDotConstraintCommand(cell1, cell2))
         
         if not commands:
             messagebox.showinfo("No Constraints", "No constraints found to remove in selection.")
             return False
         
-        batch_command = BatchCommand(commands, f"Remove {len(commands)} constraints")
+        batch_command = BatchCommand.make(commands, f"Remove {len(commands)} constraints")
         success = self.grid.command_history.execute_command(batch_command, self.grid)
         
         if success:
@@ -477,64 +581,136 @@ class ConstraintEditor:
             self.canvas.canvas.delete(item_id)
         self.preview_items.clear()
 
+    def _guides_stale(self) -> bool:
+        """True if drawn guides can't be patched incrementally (grid edited or canvas cleared)."""
+        if self._guides_rev != self.grid.revision:
+            return True
+        # A full canvas redraw (delete("all")) destroys the guide items
+        for item_id in self._hl_by_cell.values():
+            return not self.canvas.canvas.type(item_id)
+        return False
+    
     def _update_visual_guides(self):
-        """Update visual guides for selection mode."""
-        self._clear_visual_guides()
-        
+        """Bring the selection guides in line with the current selection."""
         if not self.selection_mode:
+            self._clear_visual_guides()
+            return
+        renderer = self.canvas.renderer
+        if not renderer or not hasattr(self.canvas, 'canvas_offset_x'):
             return
         
-        # Highlight selected cells with medium opacity red
-        for row, col in self.selected_cells:
-            if not self.canvas.renderer or not hasattr(self.canvas, 'canvas_offset_x'):
-                continue
-                
-            x, y = self.canvas.renderer.evenr_to_pixel(
-                row, col, 
-                self.canvas.canvas_offset_x, self.canvas.canvas_offset_y
-            )
-            
-            # Create red semi-transparent highlight
-            hex_size = self.canvas.renderer.hex_size
-            
-            # Draw filled red hexagon with medium opacity
-            highlight = self.canvas.canvas.create_polygon(
-                self.canvas.renderer.get_hex_points(x, y),
-                fill="#FF6B6B",  # Medium red color
-                stipple="gray50",  # Creates 50% opacity effect
-                outline="#CC0000",  # Darker red border
-                width=2,
-                tags="selection_guide"
-            )
-            self.guide_items.append(highlight)
-        
-        # Show possible constraint lines between selected cells
-        possible_constraints = self.get_possible_constraints(self.selected_cells)
-        for cell1, cell2 in possible_constraints:
-            if not self.canvas.renderer:
-                continue
-                
-            x1, y1 = self.canvas.renderer.evenr_to_pixel(
-                cell1[0], cell1[1], 
-                self.canvas.canvas_offset_x, self.canvas.canvas_offset_y
-            )
-            x2, y2 = self.canvas.renderer.evenr_to_pixel(
-                cell2[0], cell2[1], 
-                self.canvas.canvas_offset_x, self.canvas.canvas_offset_y
-            )
-            
-            # Check if constraint already exists
-            exists = self.grid.has_dot_constraint(cell1, cell2)
-            color = "orange" if exists else "lightblue"
-            
-            guide_line = self.canvas.canvas.create_line(
-                x1, y1, x2, y2,
-                fill=color,
-                width=2,
-                dash=(3, 3),
-                tags="selection_guide"
-            )
-            self.guide_items.append(guide_line)
+        if self._guides_stale():
+            self._clear_visual_guides()
+            self._guides_rev = self.grid.revision
+        
+        canvas = self.canvas.canvas
+        selected = self.selected_cells
+        for cell in [c for c in self._hl_by_cell if c not in selected]:
+            canvas.delete(self._hl_by_cell.pop(cell))
+        for cell in selected:
+            if cell not in self._hl_by_cell:
+                self._draw_cell_guide(cell)
+        
+        pairs = set(self.selection_pairs())
+        for pair in [p for p in self._line_by_pair if p not in pairs]:
+            canvas.delete(self._line_by_pair.pop(pair))
+        for pair in pairs:
+            if pair not in self._line_by_pair:
+                self._draw_pair_guide(pair)
+        self._raise_guides()
+    
+    def _request_redraw(self):
+        """Schedule one guide sync for the next idle tick, coalescing repeated requests."""
+        self._guides_dirty = True
+        if not self._guides_scheduled:
+            self._guides_scheduled = True
+            self.canvas.canvas.after_idle(self._flush_redraw)
+    
+    def _flush_redraw(self):
+        """Idle callback: run the pending guide sync, if any."""
+        self._guides_scheduled = False
+        if self._guides_dirty:
+            self._guides_dirty = False
+            self._update_visual_guides()
+    
+    def _update_guides_for_cell(self, cell: Tuple[int, int]):
+        """Patch the guides after one cell was toggled: its highlight and lines only."""
+        if not self._hl_by_cell or self._guides_stale():
+            self._update_visual_guides()
+            return
+        
+        canvas = self.canvas.canvas
+        partners = self._nbrs(cell) & self.selected_cells
+        if cell in self.selected_cells:
+            if cell not in self._hl_by_cell:
+                self._draw_cell_guide(cell)
+            for other in partners:
+                pair = (cell, other) if cell < other else (other, cell)
+                if pair not in self._line_by_pair:
+                    self._draw_pair_guide(pair)
+        else:
+            item_id = self._hl_by_cell.pop(cell, None)
+            if item_id is not None:
+                canvas.delete(item_id)
+            for other in partners:
+                item_id = self._line_by_pair.pop((cell, other) if cell < other else (other, cell), None)
+                if item_id is not None:
+                    canvas.delete(item_id)
+        self._raise_guides()
+    
+    def _draw_cell_guide(self, cell: Tuple[int, int]):
+        """Highlight a selected cell with medium opacity red."""
+        renderer = self.canvas.renderer
+        x, y = renderer.evenr_to_pixel(cell[0], cell[1],
+                                       self.canvas.canvas_offset_x, self.canvas.canvas_offset_y)
+        self._hl_by_cell[cell] = self.canvas.canvas.create_polygon(
+            renderer.get_hex_points(x, y),
+            fill="#FF6B6B",  # Medium red color
+            stipple="gray50",  # Creates 50% opacity effect
+            outline="#CC0000",  # Darker red border
+            width=2,
+            tags="selection_guide"
+        )
+    
+    def _draw_pair_guide(self, pair: Tuple[Tuple[int, int], Tuple[int, int]]):
+        """Draw a possible-constraint line; orange if the constraint already exists."""
+        renderer = self.canvas.renderer
+        ox, oy = self.canvas.canvas_offset_x, self.canvas.canvas_offset_y
+        (r1, c1), (r2, c2) = pair
+        x1, y1 = renderer.evenr_to_pixel(r1, c1, ox, oy)
+        x2, y2 = renderer.evenr_to_pixel(r2, c2, ox, oy)
+        color = "orange" if pair in self.grid.dot_constraints else "lightblue"
+        self._line_by_pair[pair] = self.canvas.canvas.create_line(
+            x1, y1, x2, y2,
+            fill=color,
+            width=2,
+            dash=(3, 3),
+            tags=("selection_guide", "selection_guide_line")
+        )
+    
+    def _raise_guides(self):
+        """Keep guides above the cells, and lines above highlights."""
+        canvas = self.canvas.canvas
+        canvas.tag_raise("selection_guide")
+        canvas.tag_raise("selection_guide_line")
+
+    def _classify_selection(self) -> Dict[CellState, List[Tuple[int, int]]]:
+        """Selected cells grouped by state; rebuilt only when the selection or grid changes."""
+        buckets, key = self._class_cache
+        current = (self._sel_ver, self.grid.revision)
+        if buckets is None or key != current:
+            buckets = defaultdict(list)
+            cell_states = self.grid.cell_states
+            for cell in self.selected_cells:
+                buckets[cell_states.get(cell, HOLE_ENTRY)[0]].append(cell)
+            buckets = dict(buckets)
+            self._class_cache = (buckets, current)
+        return buckets
+    
+    def _selected_playable(self) -> Set[Tuple[int, int]]:
+        """Selected cells that are currently playable (EMPTY or PREFILLED)."""
+        buckets = self._classify_selection()
+        return set(buckets.get(CellState.EMPTY, ())).union(buckets.get(CellState.PREFILLED, ()))
 
     def _batch_number_by_selection_order(self):
         """Number cells in the order they were selected (clicked)."""
@@ -542,23 +718,16 @@ class ConstraintEditor:
             return False
         
         # Only number playable cells, in selection order
-        playable_cells = []
-        for cell in self.selection_order:
-            if cell in self.selected_cells:  # Still selected
-                row, col = cell
-                state, _ = self.grid.get_cell_state(row, col)
-                if state in (CellState.EMPTY, CellState.PREFILLED):
-                    playable_cells.append(cell)
+        playable = self._selected_playable()
+        playable_cells = [cell for cell in self.selection_order if cell in playable]
         
         if not playable_cells:
             messagebox.showwarning("No Playable Cells", "No playable cells in selection order.")
             return False
         
-        commands = []
-        for i, (row, col) in enumerate(playable_cells, 1):
-            commands.append(SetCellValueCommand(row, col, i))
+        commands = [SetCellValueCommand(row, col, i) for i, (row, col) in enumerate(playable_cells, 1)]
         
-        batch_command = BatchCommand(commands, f"Number {len(commands)} cells by selection order")
+        batch_command = BatchCommand.make(commands, f"Number {len(commands)} cells by selection order")
         success = self.grid.command_history.execute_command(batch_command, self.grid)
         
         if success:
@@ -571,25 +740,16 @@ class ConstraintEditor:
         if not self.selection_mode or not self.selected_cells:
             return False
         
-        # Get playable cells and sort by position
-        playable_cells = []
-        for row, col in self.selected_cells:
-            state, _ = self.grid.get_cell_state(row, col)
-            if state in (CellState.EMPTY, CellState.PREFILLED):
-                playable_cells.append((row, col))
+        # Playable cells sorted by position (row first, then column)
+        sorted_cells = _sorted_by_position(self._selected_playable(), self.grid.cols)
         
-        if not playable_cells:
+        if not sorted_cells:
             messagebox.showwarning("No Playable Cells", "No playable cells selected.")
             return False
         
-        # Sort by position (row first, then column)
-        sorted_cells = sorted(playable_cells)
-        
-        commands = []
-        for i, (row, col) in enumerate(sorted_cells, 1):
-            commands.append(SetCellValueCommand(row, col, i))
+        commands = [SetCellValueCommand(row, col, i) for i, (row, col) in enumerate(sorted_cells, 1)]
         
-        batch_command = BatchCommand(commands, f"Number {len(commands)} cells by position")
+        batch_command = BatchCommand.make(commands, f"Number {len(commands)} cells by position")
         success = self.grid.command_history.execute_command(batch_command, self.grid)
         
         if success:
@@ -605,13 +765,8 @@ class ConstraintEditor:
             return False
 
         # Resolve playable cells in explicit selection order
-        playable_cells = []
-        for cell in self.selection_order:
-            if cell in self.selected_cells:
-                r, c = cell
-                state, _ = self.grid.get_cell_state(r, c)
-                if state in (CellState.EMPTY, CellState.PREFILLED):
-                    playable_cells.append((r, c))
+        playable = self._selected_playable()
+        playable_cells = [cell for cell in self.selection_order if cell in playable]
 
         if not playable_cells:
             messagebox.showwarning("No Playable Cells", "No playable cells in selection.", parent=self._dialog_parent())
@@ -635,7 +790,7 @@ class ConstraintEditor:
         if LiveBatchCommand is None:
             commands = [SetCellValueCommand(r, c, start_num + i)
                         for i, (r, c) in enumerate(playable_cells)]
-            batch_command = BatchCommand(commands, f"Number {len(commands)} cells starting from {start_num}")
+            batch_command = BatchCommand.make(commands, f"Number {len(commands)} cells starting from {start_num}")
             success = self.grid.command_history.execute_command(batch_command, self.grid)
             if success:
                 self.canvas.redraw_grid()
@@ -660,23 +815,23 @@ class ConstraintEditor:
                     self.canvas._notify_grid_change()
                 self.canvas.redraw_grid()
                 return False
-            if hasattr(self.canvas, "_notify_grid_change"):
-                self.canvas._notify_grid_change()
-            self.canvas.redraw_grid()
+            # No prompt between cells: refresh just this cell, notify once at the end
+            self.canvas.redraw_cell(row, col)
         self._clear_current_number_highlight()
 
-        success = self.grid.command_history.execute_command(live, self.grid)
-        if success:
-            end_num = start_num + len(playable_cells) - 1
-            messagebox.showinfo(
-                "Custom Numbering",
-                f"Numbered {len(playable_cells)} cells from {start_num} to {end_num}",
-                parent=self._dialog_parent()
-            )
-            if hasattr(self.canvas, "_notify_grid_change"):
-                self.canvas._notify_grid_change()
-            self.canvas.redraw_grid()
-        return success
+        # Values are already applied; only record the batch (skip it if all were no-ops)
+        if live.commands:
+            self.grid.command_history.record_executed(live)
+        if hasattr(self.canvas, "_notify_grid_change"):
+            self.canvas._notify_grid_change()
+        self.canvas.redraw_grid()
+        end_num = start_num + len(playable_cells) - 1
+        messagebox.showinfo(
+            "Custom Numbering",
+            f"Numbered {len(playable_cells)} cells from {start_num} to {end_num}",
+            parent=self._dialog_parent()
+        )
+        return True
 
     def _batch_number_by_selection_ask_each(self):
         """Number cells by selection order, prompting for each value.
@@ -689,13 +844,8 @@ class ConstraintEditor:
             return False
 
         # Resolve playable cells in explicit selection order
-        playable_cells = []
-        for cell in self.selection_order:
-            if cell in self.selected_cells:
-                r, c = cell
-                state, _ = self.grid.get_cell_state(r, c)
-                if state in (CellState.EMPTY, CellState.PREFILLED):
-                    playable_cells.append((r, c))
+        playable = self._selected_playable()
+        playable_cells = [cell for cell in self.selection_order if cell in playable]
 
         if not playable_cells:
             messagebox.showwarning("No Playable Cells", "No playable cells in selection.", parent=self._dialog_parent())
@@ -724,7 +874,7 @@ class ConstraintEditor:
                 last_val = val
             if not commands:
                 return False
-            batch = BatchCommand(commands, f"Number {len(commands)} cells (ask individually)")
+            batch = BatchCommand.make(commands, f"Number {len(commands)} cells (ask individually)")
             ok = self.grid.command_history.execute_command(batch, self.grid)
             if ok:
                 self.canvas.redraw_grid()
@@ -733,81 +883,90 @@ class ConstraintEditor:
         live = LiveBatchCommand(f"Number {len(playable_cells)} cells (ask individually)")
         last_val = None
 
-        for (r, c) in playable_cells:
-            self._show_current_number_highlight(r, c)
-            while True:
-                initial = (last_val + 1) if last_val is not None else 1
-                val = self._askinteger_topmost(
-                    "Number cell",
-                    f"Enter value for cell ({r},{c}):",
-                    minvalue=1, maxvalue=max_val, initialvalue=initial
-                )
-                if val is None:
-                    choice = self._askyesnocancel_topmost(
-                        "Abort numbering?",
-                        "Do you want to abort numbering?\n\n"
-                        "Yes = Abort and discard all changes so far\n"
-                        "No = Skip this cell and continue\n"
-                        "Cancel = Try again for this cell"
+        # Resolve and pin the dialog parent once for the whole prompt loop
+        parent = self._dialog_parent()
+        self._set_topmost(parent, True)
+        try:
+            for (r, c) in playable_cells:
+                self._show_current_number_highlight(r, c)
+                while True:
+                    initial = (last_val + 1) if last_val is not None else 1
+                    val = self._askinteger_topmost(
+                        "Number cell",
+                        f"Enter value for cell ({r},{c}):",
+                        parent=parent, pinned=True,
+                        minvalue=1, maxvalue=max_val, initialvalue=initial
                     )
-                    if choice is True:
+                    if val is None:
+                        choice = self._askyesnocancel_topmost(
+                            "Abort numbering?",
+                            "Do you want to abort numbering?\n\n"
+                            "Yes = Abort and discard all changes so far\n"
+                            "No = Skip this cell and continue\n"
+                            "Cancel = Try again for this cell",
+                            parent=parent, pinned=True
+                        )
+                        if choice is True:
+                            self._clear_current_number_highlight()
+                            live.undo(self.grid)
+                            if hasattr(self.canvas, "_notify_grid_change"):
+                                self.canvas._notify_grid_change()
+                            self.canvas.redraw_grid()
+                            return False
+                        elif choice is False:
+                            self._clear_current_number_highlight()
+                            break  # skip this cell
+                        else:
+                            continue  # retry same cell
+
+                    cmd = SetCellValueCommand(r, c, val)
+                    if not live.add_and_execute(self.grid, cmd):
                         self._clear_current_number_highlight()
+                        messagebox.showerror("Numbering Failed", "Could not set this value. Aborting.",
+                                            parent=parent)
                         live.undo(self.grid)
                         if hasattr(self.canvas, "_notify_grid_change"):
                             self.canvas._notify_grid_change()
                         self.canvas.redraw_grid()
                         return False
-                    elif choice is False:
-                        self._clear_current_number_highlight()
-                        break  # skip this cell
-                    else:
-                        continue  # retry same cell
-
-                cmd = SetCellValueCommand(r, c, val)
-                if not live.add_and_execute(self.grid, cmd):
-                    self._clear_current_number_highlight()
-                    messagebox.showerror("Numbering Failed", "Could not set this value. Aborting.",
-                                        parent=self._dialog_parent())
-                    live.undo(self.grid)
+                    last_val = val
                     if hasattr(self.canvas, "_notify_grid_change"):
                         self.canvas._notify_grid_change()
-                    self.canvas.redraw_grid()
-                    return False
-                last_val = val
-                if hasattr(self.canvas, "_notify_grid_change"):
-                    self.canvas._notify_grid_change()
-                self.canvas.redraw_grid()
-                self._clear_current_number_highlight()
-                break  # next cell
+                    self.canvas.redraw_cell(r, c)
+                    self._clear_current_number_highlight()
+                    break  # next cell
+        finally:
+            self._set_topmost(parent, False)
 
         if not getattr(live, "commands", None):
             return False
-        ok = self.grid.command_history.execute_command(live, self.grid)
-        if ok:
-            if hasattr(self.canvas, "_notify_grid_change"):
-                self.canvas._notify_grid_change()
-            self.canvas.redraw_grid()
-        return ok
+        # Values are already applied; only record the batch
+        self.grid.command_history.record_executed(live)
+        if hasattr(self.canvas, "_notify_grid_change"):
+            self.canvas._notify_grid_change()
+        self.canvas.redraw_grid()
+        return True
 
     def get_batch_operations_menu(self) -> Dict[str, Callable]:
-        """Get available batch operations for selected cells."""
+        """Get available batch operations for selected cells (shared dict; don't mutate)."""
         if not self.selection_mode or not self.selected_cells:
             return {}
         
         # Analyze selected cells to show only relevant operations
-        empty_cells = 0
-        prefilled_cells = 0
-        blocked_cells = 0
-        
-        for row, col in self.selected_cells:
-            state, value = self.grid.get_cell_state(row, col)
-            if state == CellState.EMPTY:
-                empty_cells += 1
-            elif state == CellState.PREFILLED:
-                prefilled_cells += 1
-            elif state == CellState.NONPLAYABLE:
-                blocked_cells += 1
-        
+        buckets = self._classify_selection()
+        has_playable = CellState.EMPTY in buckets or CellState.PREFILLED in buckets
+        key = (has_playable, CellState.PREFILLED in buckets, CellState.NONPLAYABLE in buckets)
+        
+        # The menu only depends on which kinds of cells are selected; build each variant once
+        operations = self._ops_cache.get(key)
+        if operations is None:
+            operations = self._build_batch_operations(*key)
+            self._ops_cache[key] = operations
+        return operations
+    
+    def _build_batch_operations(self, has_playable: bool, has_prefilled: bool,
+                                has_blocked: bool) -> Dict[str, Callable]:
+        """Operation name -> bound action, for one combination of selected cell kinds."""
         operations = {}
         
         # Constraint operations
@@ -815,18 +974,18 @@ class ConstraintEditor:
         operations["Remove All Constraints"] = self.remove_batch_constraints
         
         # State operations
-        if empty_cells > 0 or prefilled_cells > 0:
-            operations["Set All to Blocked"] = lambda: self._batch_set_state(CellState.NONPLAYABLE)
-            operations["Set All to Holes"] = lambda: self._batch_set_state(CellState.HOLE)
+        if has_playable:
+            operations["Set All to Blocked"] = partial(self._batch_set_state, CellState.NONPLAYABLE)
+            operations["Set All to Holes"] = partial(self._batch_set_state, CellState.HOLE)
         
-        if blocked_cells > 0:
-            operations["Set All to Empty"] = lambda: self._batch_set_state(CellState.EMPTY)
+        if has_blocked:
+            operations["Set All to Empty"] = partial(self._batch_set_state, CellState.EMPTY)
         
         # IMPROVED: Multiple numbering options
-        if empty_cells > 0 or prefilled_cells > 0:
+        if has_playable:
             operations["Number by selection order, starting from..."] = self._batch_number_custom_start
             operations["Number by selection order (ask individually)"] = self._batch_number_by_selection_ask_each
-            if prefilled_cells > 0:
+            if has_prefilled:
                 operations["Clear All Numbers"] = self._batch_clear_numbers
         
         # Selection operations
@@ -839,46 +998,54 @@ class ConstraintEditor:
         
         return operations
     
-    def _refresh_selection_after_state_change(self):
-        """Refresh selection to only include selectable cells after state changes."""
-        valid_selection = set()
+    def _report(self, title: str, message: str) -> None:
+        """Show an informational result without blocking when a status sink is set."""
+        if self.status_sink is not None:
+            self.status_sink(f"{title}: {message}")
+        else:
+            messagebox.showinfo(title, message)
+
+    def _refresh_selection_after_state_change(self, new_state: Optional[CellState] = None):
+        """
+        Refresh selection to only include playable cells after state changes.
         
-        for row, col in self.selected_cells:
-            # Check if cell still exists and is selectable
-            if self.grid.cell_exists(row, col):
-                state, _ = self.grid.get_cell_state(row, col)
-                if state in (CellState.EMPTY, CellState.PREFILLED):
-                    valid_selection.add((row, col))
+        new_state is the state every selected cell was just set to, if any.
+        When it is playable the whole selection is playable and is kept as
+        is; otherwise each selected cell is checked against the grid.
+        """
+        if new_state in _PLAYABLE_STATES:
+            valid_selection = self.selected_cells
+        else:
+            # Keep only cells that still exist and are playable
+            valid_selection = self.selected_cells & self.grid.get_playable_cells_set()
         
         # Update selection to only valid cells
-        self.selected_cells = valid_selection
-        self._update_visual_guides()
+        if len(valid_selection) != len(self.selected_cells):
+            self.selected_cells = valid_selection
+            self._selection_changed()
+        self._request_redraw()
 
     def _batch_set_state(self, target_state: CellState):
         """Set all selected cells to a specific state."""
         if not self.selection_mode or not self.selected_cells:
             return False
         
-        commands = []
-        changed_cells = 0
-        
-        for row, col in self.selected_cells:
-            current_state, current_value = self.grid.get_cell_state(row, col)
-            if current_state != target_state:
-                commands.append(SetCellStateCommand(row, col, target_state, None))
-                changed_cells += 1
+        cells = [cell for state, cells in self._classify_selection().items() if state != target_state
+                 for cell in cells]
+        changed_cells = len(cells)
         
-        if commands:
-            batch_command = BatchCommand(commands, f"Set {changed_cells} cells to {target_state.value}")
-            success = self.grid.command_history.execute_command(batch_command, self.grid)
+        if cells:
+            bulk_command = BulkSetStateCommand(cells, target_state,
+                                               f"Set {changed_cells} cells to {target_state.value}")
+            success = self.grid.command_history.execute_command(bulk_command, self.grid)
             
             if success:
                 # Update selection to only include cells that still exist and are selectable
-                self._refresh_selection_after_state_change()
-                messagebox.showinfo("Batch Operation", f"Changed {changed_cells} cells to {target_state.value}")
+                self._refresh_selection_after_state_change(target_state)
+                self._report("Batch Operation", f"Changed {changed_cells} cells to {target_state.value}")
             return success
         else:
-            messagebox.showinfo("Batch Operation", f"All selected cells are already {target_state.value}")
+            self._report("Batch Operation", f"All selected cells are already {target_state.value}")
             return True
 
     def _batch_number_consecutive(self):
@@ -887,28 +1054,22 @@ class ConstraintEditor:
             return False
         
         # Only number playable cells
-        playable_cells = []
-        for row, col in self.selected_cells:
-            state, _ = self.grid.get_cell_state(row, col)
-            if state in (CellState.EMPTY, CellState.PREFILLED):
-                playable_cells.append((row, col))
+        playable_cells = self._selected_playable()
         
         if not playable_cells:
             messagebox.showwarning("No Playable Cells", "No playable cells selected for numbering.")
             return False
         
         # Sort cells by position for consistent numbering
-        sorted_cells = sorted(playable_cells)
+        sorted_cells = _sorted_by_position(playable_cells, self.grid.cols)
+        count = len(sorted_cells)
         
-        commands = []
-        for i, (row, col) in enumerate(sorted_cells, 1):
-            commands.append(SetCellValueCommand(row, col, i))
-        
-        batch_command = BatchCommand(commands, f"Number {len(commands)} cells consecutively")
-        success = self.grid.command_history.execute_command(batch_command, self.grid)
+        bulk_command = BulkSetValueCommand(sorted_cells, range(1, count + 1),
+                                           f"Number {count} cells consecutively")
+        success = self.grid.command_history.execute_command(bulk_command, self.grid)
         
         if success:
-            messagebox.showinfo("Batch Numbering", f"Numbered {len(commands)} cells from 1 to {len(commands)}")
+            self._report("Batch Numbering", f"Numbered {count} cells from 1 to {count}")
         return success
 
     def _batch_clear_numbers(self):
@@ -916,77 +1077,73 @@ class ConstraintEditor:
         if not self.selection_mode or not self.selected_cells:
             return False
         
-        commands = []
-        for row, col in self.selected_cells:
-            current_state, current_value = self.grid.get_cell_state(row, col)
-            if current_state == CellState.PREFILLED:
-                commands.append(SetCellStateCommand(row, col, CellState.EMPTY, None))
+        cells = self._classify_selection().get(CellState.PREFILLED, [])
         
-        if commands:
-            batch_command = BatchCommand(commands, f"Clear numbers from {len(commands)} cells")
-            success = self.grid.command_history.execute_command(batch_command, self.grid)
+        if cells:
+            bulk_command = BulkSetStateCommand(cells, CellState.EMPTY, f"Clear numbers from {len(cells)} cells")
+            success = self.grid.command_history.execute_command(bulk_command, self.grid)
             if success:
-                messagebox.showinfo("Clear Numbers", f"Cleared numbers from {len(commands)} cells")
+                self._report("Clear Numbers", f"Cleared numbers from {len(cells)} cells")
             return success
         else:
-            messagebox.showinfo("Clear Numbers", "No numbered cells in selection to clear")
+            self._report("Clear Numbers", "No numbered cells in selection to clear")
             return True
 
+    def _selection_frontier(self) -> Set[Tuple[int, int]]:
+        """Existing cells adjacent to the selection but not in it."""
+        selected = self.selected_cells
+        frontier = set().union(*map(self._nbrs, selected)) - selected
+        cell_exists = self.grid.cell_exists
+        return {cell for cell in frontier if cell_exists(*cell)}
+
     def _grow_selection(self):
         """Expand selection by adding ALL neighbors of selected cells."""
         if not self.selection_mode:
             return
         
         if not self.selected_cells:
-            messagebox.showinfo("Grow Selection", "No cells selected to grow from.")
+            self._report("Grow Selection", "No cells selected to grow from.")
             return
         
-        new_cells = set(self.selected_cells)  # Start with current selection
-        for row, col in list(self.selected_cells):
-            neighbors = self.grid.get_neighbors(row, col)
-            for nr, nc in neighbors:
-                if (nr, nc) not in self.selected_cells:  # Don't add already selected cells
-                    state, _ = self.grid.get_cell_state(nr, nc)
-                    # Allow selection of any existing cell type
-                    if self.grid.cell_exists(nr, nc):
-                        new_cells.add((nr, nc))
-                        self.selection_order.append((nr, nc))  # Track order of addition
-        
-        added_count = len(new_cells) - len(self.selected_cells)
-        self.selected_cells = new_cells
-        self._update_visual_guides()
+        # Allow selection of any existing cell type
+        frontier = self._selection_frontier()
+        self.selection_order.update(dict.fromkeys(_sorted_by_position(frontier, self.grid.cols)))  # Track order of addition
         
+        added_count = len(frontier)
         if added_count > 0:
-            messagebox.showinfo("Grow Selection", f"Added {added_count} neighboring cells to selection")
+            # Add only the delta, in place, rather than copying the selection
+            self.selected_cells |= frontier
+            self._selection_changed()
+            self._request_redraw()
+            self._report("Grow Selection", f"Added {added_count} neighboring cells to selection")
         else:
-            messagebox.showinfo("Grow Selection", "No additional neighbors to add")
+            self._report("Grow Selection", "No additional neighbors to add")
 
     def _shrink_selection(self):
         """Remove cells from selection that have fewer than 2 selected neighbors."""
         if not self.selection_mode or len(self.selected_cells) <= 2:
-            messagebox.showinfo("Shrink Selection", "Need at least 3 selected cells to shrink.")
+            self._report("Shrink Selection", "Need at least 3 selected cells to shrink.")
             return
         
-        cells_to_keep = set()
-        for row, col in self.selected_cells:
-            neighbors = self.grid.get_neighbors(row, col)
-            selected_neighbor_count = sum(1 for n in neighbors if n in self.selected_cells)
-            
-            # Keep cells with 2 or more selected neighbors (well connected)
-            if selected_neighbor_count >= 2:
-                cells_to_keep.add((row, col))
+        # Keep cells with 2 or more selected neighbors (well connected)
+        selected = self.selected_cells
+        nbrs = self._nbrs
+        cells_to_keep = {cell for cell in selected if len(nbrs(cell) & selected) >= 2}
         
         if len(cells_to_keep) < len(self.selected_cells):
-            removed_count = len(self.selected_cells) - len(cells_to_keep)
+            removed = self.selected_cells - cells_to_keep
+            removed_count = len(removed)
             self.selected_cells = cells_to_keep
+            self._selection_changed()
             
             # Update selection order to only include remaining cells
-            self.selection_order = [cell for cell in self.selection_order if cell in cells_to_keep]
+            for cell in removed:
+                self.selection_order.pop(cell, None)
             
-            self._update_visual_guides()
-            messagebox.showinfo("Shrink Selection", f"Removed {removed_count} edge cells from selection")
+            self._request_redraw()
+            self._report("Shrink Selection", f"Removed {removed_count} edge cells from selection")
         else:
-            messagebox.showinfo("Shrink Selection", "All selected cells are well-connected - nothing to shrink")
+            self._report("Shrink Selection", "All selected cells are well-connected - nothing to shrink")
 
     def _select_neighbors(self):
         """Replace selection with ONLY the neighbors of current selection."""
@@ -994,47 +1151,38 @@ class ConstraintEditor:
             return
         
         if not self.selected_cells:
-            messagebox.showinfo("Select Neighbors", "No cells selected to find neighbors of.")
+            self._report("Select Neighbors", "No cells selected to find neighbors of.")
             return
         
         # Find all neighbors but DON'T include current selection
-        neighbor_cells = set()
-        for row, col in self.selected_cells:
-            neighbors = self.grid.get_neighbors(row, col)
-            for nr, nc in neighbors:
-                if (nr, nc) not in self.selected_cells:  # Only neighbors, not current selection
-                    if self.grid.cell_exists(nr, nc):
-                        neighbor_cells.add((nr, nc))
+        neighbor_cells = self._selection_frontier()
         
         if neighbor_cells:
             old_count = len(self.selected_cells)
             self.selected_cells = neighbor_cells
-            self.selection_order = list(neighbor_cells)  # New order
-            self._update_visual_guides()
-            messagebox.showinfo("Select Neighbors", 
+            self._selection_changed()
+            self.selection_order = dict.fromkeys(neighbor_cells)  # New order
+            self._request_redraw()
+            self._report("Select Neighbors", 
                             f"Replaced {old_count} selected cells with {len(neighbor_cells)} neighbors")
         else:
-            messagebox.showinfo("Select Neighbors", "No neighbors found")
+            self._report("Select Neighbors", "No neighbors found")
 
     def _invert_selection(self):
         """Invert selection - select all unselected playable cells, deselect selected ones."""
         if not self.selection_mode:
             return
         
-        all_playable = set()
-        for row in range(self.grid.rows):
-            for col in range(self.grid.cols):
-                state, _ = self.grid.get_cell_state(row, col)
-                if state in (CellState.EMPTY, CellState.PREFILLED):
-                    all_playable.add((row, col))
+        all_playable = self.grid.get_playable_cells_set()
         
         # Invert: selected becomes unselected, unselected becomes selected
         old_count = len(self.selected_cells)
         self.selected_cells = all_playable - self.selected_cells
+        self._selection_changed()
         new_count = len(self.selected_cells)
         
-        self._update_visual_guides()
-        messagebox.showinfo("Invert Selection", f"Selection inverted: {old_count} → {new_count} cells")
+        self._request_redraw()
+        self._report("Invert Selection", f"Selection inverted: {old_count} → {new_count} cells")
 
     def _clear_selection(self):
         """Clear all selected cells."""
@@ -1043,31 +1191,38 @@ class ConstraintEditor:
         
         count = len(self.selected_cells)
         self.selected_cells.clear()
-        self._update_visual_guides()
-        messagebox.showinfo("Clear Selection", f"Cleared {count} selected cells")
+        self._selection_changed()
+        self._request_redraw()
+        self._report("Clear Selection", f"Cleared {count} selected cells")
 
     def _clear_visual_guides(self):
-        """Clear visual guide items."""
-        for item_id in self.guide_items:
-            self.canvas.canvas.delete(item_id)
-        self.guide_items.clear()
+        """Delete all selection guide items."""
+        if self._hl_by_cell or self._line_by_pair:
+            # Every guide item carries this tag: one Tk call deletes them all
+            self.canvas.canvas.delete("selection_guide")
+        self._hl_by_cell.clear()
+        self._line_by_pair.clear()
     
     def get_constraint_analysis(self) -> Dict[str, Any]:
-        """Get comprehensive constraint analysis."""
+        """Get comprehensive constraint analysis (cached until the grid changes; don't mutate)."""
+        analysis, revision = self._analysis_cache
+        if analysis is not None and revision == self.grid.revision:
+            return analysis
+        
         conflicts = self.validator.detect_constraint_conflicts()
         total_constraints = len(self.grid.dot_constraints)
-        playable_cells = len(self.grid.get_playable_cells())
-        
-        # Calculate constraint density
-        max_possible = playable_cells * 6 // 2  # Each cell has max 6 neighbors, avoid double counting
+        # Calculate constraint density against the pairs that could take a dot
+        max_possible = self.validator.playable_edge_count()
         density = total_constraints / max_possible if max_possible > 0 else 0
         
-        return {
+        analysis = {
             "total_constraints": total_constraints,
             "conflicts": conflicts,
             "density": density,
             "recommendations": self._get_constraint_recommendations(conflicts, density)
         }
+        self._analysis_cache = (analysis, self.grid.revision)
+        return analysis
     
     def _get_constraint_recommendations(self, conflicts: List[ConstraintConflict], density: float) -> List[str]:
         """Generate constraint placement recommendations."""
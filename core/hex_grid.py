@@ -13,12 +13,13 @@ Phase 1 changes:
 
 NOTE: No GUI changes here; this is a pure core change.
 """
-from typing import Dict, Tuple, Optional, Set, List
+from collections import deque
+from typing import Collection, Dict, Tuple, Optional, Set, List
 from utils.evenr import coordinate_to_string, string_to_coordinate
 import json
 from utils.hex_parity import get_hex_neighbors_evenr
 # Import shared types
-from core.types import CellState, ValidationError
+from core.types import CellState, ValidationError, HOLE_ENTRY
 from core.commands import (
     # Command,
     CommandHistory,
@@ -28,10 +29,13 @@ from core.commands import (
     AddDotConstraintCommand,
     RemoveDotConstraintCommand,
     ImportPuzzleCommand,
-    BatchCommand
+    ResetGridCommand
 )
 
 
+# States a puzzle number can occupy
+_PLAYABLE_STATES = (CellState.EMPTY, CellState.PREFILLED)
+
 class HexGrid:
     """
     Grid state manager for Rikudo puzzles using EVEN-R coordinate system.
@@ -49,6 +53,7 @@ class HexGrid:
         dot_constraints: Set of constraint pairs (normalized)
         center_location: Optional center cell coordinate
         command_history: Undo/redo command stack
+        revision: Monotonic counter bumped on every state/constraint mutation
 
         loaded_adjacency: Optional[(row,col) -> set[(row,col)]]  # present only when JSON provided adjacency
     """
@@ -82,15 +87,88 @@ class HexGrid:
 
         # Optional loaded graph (adjacency) from JSON import
         self.loaded_adjacency: Optional[Dict[Tuple[int, int], Set[Tuple[int, int]]]] = None
+
+        # Mutation counter; lets callers memoize derived data (e.g. statistics)
+        self.revision: int = 0
+        # Open constraint delta logs (see begin_delta_log)
+        self._delta_logs: List[List[Tuple[str, Tuple]]] = []
+
+        # validate_connectivity() result for the revision it was computed at
+        self._connectivity_cache: Tuple[Optional[Tuple[bool, str]], int] = (None, -1)
+        # validate_puzzle() errors for the revision they were computed at
+        self._validation_cache: Tuple[Optional[Tuple[ValidationError, ...]], int] = (None, -1)
         
         # Initialize all cells as EMPTY
         self._initialize_empty_grid()
     
+    # (rows, cols) -> all-EMPTY cell_states mapping, shared across instances
+    _EMPTY_TEMPLATES: Dict[Tuple[int, int], Dict[Tuple[int, int], Tuple[CellState, Optional[int]]]] = {}
+
     def _initialize_empty_grid(self) -> None:
         """Initialize all cells to EMPTY state (not recorded in history)."""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.cell_states[(row, col)] = (CellState.EMPTY, None)
+        template = HexGrid._EMPTY_TEMPLATES.get((self.rows, self.cols))
+        if template is None:
+            empty = (CellState.EMPTY, None)
+            template = {(row, col): empty
+                        for row in range(self.rows) for col in range(self.cols)}
+            HexGrid._EMPTY_TEMPLATES[(self.rows, self.cols)] = template
+        # Entries are immutable tuples, so a shallow copy is independent
+        self.cell_states = dict(template)
+        # Every cell is EMPTY, so the indexes follow without a scan
+        self._playable_set: Set[Tuple[int, int]] = set(template)
+        self._cells_by_value: Dict[int, Set[Tuple[int, int]]] = {}
+        self._state_counts: Dict[CellState, int] = dict.fromkeys(CellState, 0)
+        self._state_counts[CellState.EMPTY] = len(template)
+        self._invalidate_neighbor_cache()
+    
+    def _rebuild_indexes(self) -> None:
+        """Recompute derived cell indexes after cell_states was replaced or bulk-written."""
+        self._playable_set: Set[Tuple[int, int]] = {
+            cell for cell, (state, _) in self.cell_states.items() if state in _PLAYABLE_STATES}
+        # Number of cells in each state (list.count compares by identity in C,
+        # avoiding the Python-level Enum.__hash__ a dict or Counter would call)
+        states = [state for state, _ in self.cell_states.values()]
+        self._state_counts: Dict[CellState, int] = {state: states.count(state) for state in CellState}
+        # Prefilled value -> cells holding it (more than one only in invalid puzzles)
+        self._cells_by_value: Dict[int, Set[Tuple[int, int]]] = {}
+        if self._state_counts[CellState.PREFILLED]:
+            prefilled = CellState.PREFILLED
+            for cell, (state, value) in self.cell_states.items():
+                if state is prefilled and value is not None:
+                    self._cells_by_value.setdefault(value, set()).add(cell)
+        self._invalidate_neighbor_cache()
+    
+    def _invalidate_neighbor_cache(self) -> None:
+        """Drop every memoized parity neighbor list (see get_neighbors)."""
+        self._neighbor_cache: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    
+    def _write_cell(self, cell: Tuple[int, int], entry: Tuple[CellState, Optional[int]]) -> None:
+        """Store one cell_states entry and keep the derived indexes in step."""
+        old_state, old_value = self.cell_states.get(cell, HOLE_ENTRY)
+        self.cell_states[cell] = entry
+        if old_state is not entry[0]:
+            self._state_counts[old_state] -= 1
+            self._state_counts[entry[0]] += 1
+        if entry[0] in _PLAYABLE_STATES:
+            self._playable_set.add(cell)
+        else:
+            self._playable_set.discard(cell)
+        
+        if old_state is CellState.PREFILLED and old_value is not None:
+            holders = self._cells_by_value.get(old_value)
+            if holders is not None:
+                holders.discard(cell)
+                if not holders:
+                    del self._cells_by_value[old_value]
+        if entry[0] is CellState.PREFILLED and entry[1] is not None:
+            self._cells_by_value.setdefault(entry[1], set()).add(cell)
+        
+        # Neighbor lists only depend on hole-ness: forget the cell's and its neighbors'
+        if (old_state is CellState.HOLE) != (entry[0] is CellState.HOLE) and self._neighbor_cache:
+            cache = self._neighbor_cache
+            cache.pop(cell, None)
+            for other in self._neighbor_table().get(cell, ()):
+                cache.pop(other, None)
     
     # =============================================================================
     # CELL STATE QUERIES
@@ -110,8 +188,8 @@ class HexGrid:
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return False
         
-        state, _ = self.cell_states.get((row, col), (CellState.HOLE, None))
-        return state != CellState.HOLE
+        state, _ = self.cell_states.get((row, col), HOLE_ENTRY)
+        return state is not CellState.HOLE
     
     def get_cell_state(self, row: int, col: int) -> Tuple[CellState, Optional[int]]:
         """
@@ -125,7 +203,7 @@ class HexGrid:
             Tuple of (CellState, optional_value)
             Returns (HOLE, None) for out-of-bounds cells
         """
-        return self.cell_states.get((row, col), (CellState.HOLE, None))
+        return self.cell_states.get((row, col), HOLE_ENTRY)
     
     def get_all_existing_cells(self) -> Set[Tuple[int, int]]:
         """
@@ -134,11 +212,8 @@ class HexGrid:
         Returns:
             Set of (row, col) coordinates
         """
-        existing = set()
-        for (row, col), (state, _) in self.cell_states.items():
-            if state != CellState.HOLE:
-                existing.add((row, col))
-        return existing
+        hole = CellState.HOLE
+        return {cell for cell, (state, _) in self.cell_states.items() if state is not hole}
     
     def get_playable_cells(self) -> Dict[Tuple[int, int], Optional[int]]:
         """
@@ -147,11 +222,30 @@ class HexGrid:
         Returns:
             Dict mapping (row, col) to optional value
         """
-        playable = {}
-        for (row, col), (state, value) in self.cell_states.items():
-            if state in (CellState.EMPTY, CellState.PREFILLED):
-                playable[(row, col)] = value
-        return playable
+        # Scan cell_states rather than the playable set to keep row-major order (JSON export)
+        return {cell: value for cell, (state, value) in self.cell_states.items()
+                if state in _PLAYABLE_STATES}
+    
+    def get_playable_cells_set(self) -> Set[Tuple[int, int]]:
+        """
+        Get the coordinates of all playable cells (EMPTY or PREFILLED).
+        
+        The set is maintained incrementally and returned as-is; treat it as
+        read-only and copy it before holding on to it across edits.
+        
+        Returns:
+            Set of (row, col)
+        """
+        return self._playable_set
+    
+    def get_playable_count(self) -> int:
+        """
+        Count playable cells (EMPTY or PREFILLED).
+        
+        Returns:
+            Number of playable cells
+        """
+        return len(self._playable_set)
     
     def get_max_possible_value(self) -> int:
         """
@@ -160,7 +254,7 @@ class HexGrid:
         Returns:
             Count of playable cells (the max value for the puzzle)
         """
-        return len(self.get_playable_cells())
+        return self.get_playable_count()
     
     def has_duplicate_value(self, value: int, exclude_cell: Optional[Tuple[int, int]] = None) -> bool:
         """
@@ -173,12 +267,10 @@ class HexGrid:
         Returns:
             True if value exists elsewhere in the puzzle
         """
-        for (row, col), (state, cell_value) in self.cell_states.items():
-            if exclude_cell and (row, col) == exclude_cell:
-                continue
-            if state == CellState.PREFILLED and cell_value == value:
-                return True
-        return False
+        holders = self._cells_by_value.get(value)
+        if not holders:
+            return False
+        return len(holders) > 1 or exclude_cell not in holders
     
     # =============================================================================
     # NEIGHBOR CALCULATION (EVEN-R or LOADED GRAPH)
@@ -197,24 +289,56 @@ class HexGrid:
         Get all valid neighbors.
         If a JSON adjacency was loaded, that is authoritative.
         Otherwise, delegate to canonical EVEN-R helper.
+        The returned list may be shared; don't mutate it.
         """
-        if not self.cell_exists(row, col):
+        cell = (row, col)
+        # Fallback: parity neighbors from the shape's table, minus holes
+        # (memoized per cell until a hole appears or disappears next to it;
+        # a cell turning into a hole drops its own entry, so a hit is a cell
+        # that exists)
+        if self.loaded_adjacency is None:
+            neighbors = self._neighbor_cache.get(cell)
+            if neighbors is not None:
+                return neighbors
+        
+        # Out-of-bounds cells are absent from cell_states
+        states = self.cell_states
+        hole = CellState.HOLE
+        if states.get(cell, HOLE_ENTRY)[0] is hole:
             return []
         
         # Prefer loaded graph
         if self.loaded_adjacency is not None:
-            return list(self.loaded_adjacency.get((row, col), set()))
+            return list(self.loaded_adjacency.get(cell, set()))
 
-        # Fallback: compute from parity
-        row_lengths = self._row_lengths_rect()
-        # Get neighbors from canonical EVEN-R helper
-        candidates = get_hex_neighbors_evenr(row_lengths, row, col)
-        neighbors = []
-        for nr, nc in candidates:
-            if self.cell_exists(nr, nc):
-                neighbors.append((nr, nc))
+        neighbors = [nbr for nbr in self._neighbor_table()[cell]
+                     if states.get(nbr, HOLE_ENTRY)[0] is not hole]
+        self._neighbor_cache[cell] = neighbors
         return neighbors
     
+    # (rows, cols) -> in-bounds EVEN-R neighbors of every cell, shared across instances
+    _NEIGHBOR_TABLES: Dict[Tuple[int, int], Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]] = {}
+    
+    def _neighbor_table(self) -> Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]:
+        """Geometric neighbor table for the current shape (built once per shape)."""
+        table = HexGrid._NEIGHBOR_TABLES.get((self.rows, self.cols))
+        if table is None:
+            row_lengths = self._row_lengths_rect()
+            # Get neighbors from canonical EVEN-R helper
+            table = {(row, col): tuple(get_hex_neighbors_evenr(row_lengths, row, col))
+                     for row in range(self.rows) for col in range(self.cols)}
+            HexGrid._NEIGHBOR_TABLES[(self.rows, self.cols)] = table
+        return table
+    
+    def _edge_lookup(self) -> Dict[Tuple[int, int], Collection[Tuple[int, int]]]:
+        """
+        Cell -> adjacent cells in the active graph, for edge checks between
+        cells already known to be playable (holes are not filtered out).
+        """
+        if self.loaded_adjacency is not None:
+            return self.loaded_adjacency
+        return self._neighbor_table()
+    
     # =============================================================================
     # Graph sanitization helpers
     # =============================================================================
@@ -256,7 +380,7 @@ class HexGrid:
             # Clear previous center if exists
             if self.center_location is not None:
                 old_row, old_col = self.center_location
-                self.cell_states[(old_row, old_col)] = (CellState.EMPTY, None)
+                self._write_cell((old_row, old_col), (CellState.EMPTY, None))
             self.center_location = (row, col)
             value = None  # Center cells don't have values
             # If we are using a loaded JSON graph, ensure the center is not a vertex
@@ -266,7 +390,17 @@ class HexGrid:
             # This cell was center, now it's not
             self.center_location = None
         
-        self.cell_states[(row, col)] = (state, value)
+        self._write_cell((row, col), (state, value))
+        self._changed()
+    
+    def might_move_center(self, row: int, col: int, state: Optional[CellState] = None) -> bool:
+        """
+        Check whether setting (row, col) could change center_location.
+        
+        Only a cell becoming CENTER or the current center cell changing can
+        move it; cycling never produces CENTER, so pass state=None for cycles.
+        """
+        return state is CellState.CENTER or self.center_location == (row, col)
     
     def cycle_cell_state(self, row: int, col: int) -> None:
         """
@@ -319,6 +453,62 @@ class HexGrid:
         self.set_cell_state(row, col, CellState.PREFILLED, value)
         return True
     
+    def set_cells_bulk(self, entries: Dict[Tuple[int, int], Tuple[CellState, Optional[int]]],
+                       center: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Write many cell entries with a single revision bump (direct method).
+        
+        Overwriting the current center clears center_location, as
+        set_cell_state() does. Entries must not make a cell CENTER unless
+        that cell is passed as center, which then becomes center_location
+        before the revision is bumped (used to undo bulk edits).
+        
+        Args:
+            entries: Mapping of cell -> (state, value)
+            center: Center cell to set once the entries are written
+        """
+        rows, cols = self.rows, self.cols
+        current = self.center_location
+        write = self._write_cell
+        for cell, entry in entries.items():
+            if not (0 <= cell[0] < rows and 0 <= cell[1] < cols):
+                continue
+            if cell == current:
+                self.center_location = current = None
+            write(cell, entry)
+        if center is not None:
+            self.center_location = center
+        self._changed()
+    
+    def set_cell_values_bulk(self, values: Dict[Tuple[int, int], int]) -> bool:
+        """
+        Set numeric values in many cells at once (direct method, use commands for undo/redo).
+        
+        The values are validated against the grid as it will be after the
+        write, so cells in the batch may trade values with each other.
+        
+        Args:
+            values: Mapping of cell -> value
+        
+        Returns:
+            True if successful, False if any value is invalid (nothing is written)
+        """
+        if not all(self.cell_exists(row, col) for row, col in values):
+            return False
+        
+        max_val = len(self._playable_set.union(values))
+        new_values = set(values.values())
+        if len(new_values) != len(values) or not all(1 <= v <= max_val for v in new_values):
+            return False
+        
+        for value in new_values:
+            holders = self._cells_by_value.get(value)
+            if holders and not holders <= values.keys():
+                return False
+        
+        self.set_cells_bulk({cell: (CellState.PREFILLED, value) for cell, value in values.items()})
+        return True
+    
     def clear_cell_value(self, row: int, col: int) -> None:
         """Clear value from a cell (converts to EMPTY)."""
         if self.cell_exists(row, col):
@@ -330,7 +520,7 @@ class HexGrid:
     
     def _normalize_constraint(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """Normalize constraint pair (smaller cell first)."""
-        return tuple(sorted([cell1, cell2]))
+        return (cell1, cell2) if cell1 <= cell2 else (cell2, cell1)
     
     def add_dot_constraint(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> bool:
         """
@@ -351,22 +541,82 @@ class HexGrid:
             return False
         
         # Check cells are adjacent (uses loaded graph if present)
-        if cell2 not in self.get_neighbors(r1, c1):
+        if cell2 not in self._edge_lookup().get(cell1, ()):
             return False
         
         # Check both cells are playable
-        state1, _ = self.get_cell_state(r1, c1)
-        state2, _ = self.get_cell_state(r2, c2)
-        
-        if state1 not in (CellState.EMPTY, CellState.PREFILLED) or \
-           state2 not in (CellState.EMPTY, CellState.PREFILLED):
+        playable = self._playable_set
+        if cell1 not in playable or cell2 not in playable:
             return False
         
-        # Add normalized constraint
+        # Add normalized constraint (re-adding an existing one changes nothing)
         constraint = self._normalize_constraint(cell1, cell2)
-        self.dot_constraints.add(constraint)
+        if constraint not in self.dot_constraints:
+            self.dot_constraints.add(constraint)
+            if self._delta_logs:
+                self._log_delta("add", constraint)
+            self._changed()
         return True
     
+    def add_dot_constraints_bulk(self, pairs: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """
+        Add many dot constraints at once (direct method).
+        
+        Each pair is checked like add_dot_constraint(); invalid pairs and
+        constraints that already exist are skipped. The set is updated and the
+        revision bumped once.
+        
+        Args:
+            pairs: (cell1, cell2) pairs
+        
+        Returns:
+            Normalized constraints that were actually added
+        """
+        playable = (CellState.EMPTY, CellState.PREFILLED)
+        existing = self.dot_constraints
+        adjacency = self._edge_lookup()
+        no_neighbors = ()
+        added = []
+        seen = set()
+        for cell1, cell2 in pairs:
+            if (self.cell_states.get(cell1, HOLE_ENTRY)[0] not in playable or
+                    self.cell_states.get(cell2, HOLE_ENTRY)[0] not in playable):
+                continue
+            if cell2 not in adjacency.get(cell1, no_neighbors):
+                continue
+            constraint = self._normalize_constraint(cell1, cell2)
+            if constraint in existing or constraint in seen:
+                continue
+            seen.add(constraint)
+            added.append(constraint)
+        
+        if added:
+            existing.update(added)
+            if self._delta_logs:
+                for constraint in added:
+                    self._log_delta("add", constraint)
+            self._changed()
+        return added
+    
+    def remove_dot_constraints_bulk(self, constraints: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> int:
+        """
+        Remove many normalized dot constraints at once (direct method).
+        
+        Args:
+            constraints: Normalized constraints, e.g. from add_dot_constraints_bulk()
+        
+        Returns:
+            Number of constraints removed
+        """
+        present = [c for c in constraints if c in self.dot_constraints]
+        if present:
+            self.dot_constraints.difference_update(present)
+            if self._delta_logs:
+                for constraint in present:
+                    self._log_delta("remove", constraint)
+            self._changed()
+        return len(present)
+    
     def remove_dot_constraint(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> bool:
         """
         Remove a dot constraint between two cells (direct method).
@@ -381,6 +631,9 @@ class HexGrid:
         constraint = self._normalize_constraint(cell1, cell2)
         if constraint in self.dot_constraints:
             self.dot_constraints.remove(constraint)
+            if self._delta_logs:
+                self._log_delta("remove", constraint)
+            self._changed()
             return True
         return False
     
@@ -395,8 +648,95 @@ class HexGrid:
         Returns:
             True if constraint exists
         """
-        constraint = self._normalize_constraint(cell1, cell2)
-        return constraint in self.dot_constraints
+        if cell2 < cell1:
+            cell1, cell2 = cell2, cell1
+        return (cell1, cell2) in self.dot_constraints
+    
+    # =============================================================================
+    # CHANGE NOTIFICATION
+    # =============================================================================
+    
+    def _changed(self) -> None:
+        """Record a mutation: bump revision so revision-keyed caches refresh."""
+        self.revision += 1
+    
+    # =============================================================================
+    # STATE CHECKPOINTS (transactional rollback for batch commands)
+    # =============================================================================
+    
+    def begin_delta_log(self) -> List[Tuple[str, Tuple]]:
+        """
+        Start recording dot-constraint changes.
+        
+        Every successful add/remove is appended as ("add"|"remove", constraint)
+        until end_delta_log() is called with the returned token. Logs nest.
+        
+        Returns:
+            Opaque token (the log list itself)
+        """
+        log: List[Tuple[str, Tuple]] = []
+        self._delta_logs.append(log)
+        return log
+    
+    def end_delta_log(self, token: List[Tuple[str, Tuple]]) -> List[Tuple[str, Tuple]]:
+        """
+        Stop recording for a token from begin_delta_log().
+        
+        Returns:
+            Recorded (op, constraint) deltas in order
+        """
+        # Tokens are matched by identity: open logs with the same contents
+        # (e.g. two empty ones) compare equal
+        logs = self._delta_logs
+        if logs and logs[-1] is token:
+            logs.pop()
+        else:
+            del logs[next(i for i, log in enumerate(logs) if log is token)]
+        return token
+    
+    def _log_delta(self, op: str, constraint: Tuple) -> None:
+        for log in self._delta_logs:
+            log.append((op, constraint))
+    
+    def snapshot_state(self) -> Tuple:
+        """
+        Capture state for restore_state(); pair with release_state() on success.
+        
+        Cell states are copied; dot constraints are tracked as a delta log
+        rather than copied.
+        
+        Returns:
+            Opaque checkpoint tuple
+        """
+        return (self.cell_states.copy(), self.begin_delta_log(), self.center_location)
+    
+    def restore_state(self, checkpoint: Tuple) -> None:
+        """
+        Roll the grid back to a checkpoint taken with snapshot_state().
+        
+        Args:
+            checkpoint: Value returned by snapshot_state()
+        """
+        cell_states, log, center_location = checkpoint
+        self.end_delta_log(log)
+        for op, constraint in reversed(log):
+            if op == "add":
+                self.dot_constraints.discard(constraint)
+            else:
+                self.dot_constraints.add(constraint)
+        self.cell_states = cell_states
+        self._rebuild_indexes()
+        self.center_location = center_location
+        self._changed()
+    
+    def release_state(self, checkpoint: Tuple) -> None:
+        """
+        Discard a checkpoint that will not be restored.
+        
+        Args:
+            checkpoint: Value returned by snapshot_state()
+        """
+        self.end_delta_log(checkpoint[1])
     
     # =============================================================================
     # COMMAND-BASED MUTATIONS (use these for user operations with undo/redo)
@@ -405,17 +745,17 @@ class HexGrid:
     def cmd_set_cell_state(self, row: int, col: int, state: CellState, value: Optional[int] = None) -> bool:
         """Set cell state using command system (for undo/redo)."""
         command = SetCellStateCommand(row, col, state, value)
-        return self.command_history.execute_command(command, self)
+        return self.command_history.quick_push(command, self)
     
     def cmd_cycle_cell_state(self, row: int, col: int) -> bool:
         """Cycle cell state using command system (for undo/redo)."""
         command = CycleCellStateCommand(row, col)
-        return self.command_history.execute_command(command, self)
+        return self.command_history.quick_push(command, self)
     
     def cmd_set_cell_value(self, row: int, col: int, value: int) -> bool:
         """Set cell value using command system (for undo/redo)."""
         command = SetCellValueCommand(row, col, value)
-        return self.command_history.execute_command(command, self)
+        return self.command_history.quick_push(command, self)
     
     def cmd_add_dot_constraint(self, cell1: Tuple[int, int], cell2: Tuple[int, int]) -> bool:
         """Add dot constraint using command system (for undo/redo)."""
@@ -433,23 +773,12 @@ class HexGrid:
         return self.command_history.execute_command(command, self)
     
     def cmd_clear_grid(self) -> bool:
-        """Clear entire grid using batch command."""
-        commands = []
-        
-        # Create commands to clear all cells
-        for (row, col), (state, value) in self.cell_states.items():
-            if state != CellState.EMPTY or value is not None:
-                commands.append(SetCellStateCommand(row, col, CellState.EMPTY, None))
-        
-        # Create commands to remove all constraints
-        for constraint in list(self.dot_constraints):
-            commands.append(RemoveDotConstraintCommand(constraint[0], constraint[1]))
-        
-        if commands:
-            batch_command = BatchCommand(commands, "Clear grid")
-            return self.command_history.execute_command(batch_command, self)
-        
-        return True
+        """Clear entire grid (all cells EMPTY, no constraints) as one undoable command."""
+        command = ResetGridCommand()
+        if self.command_history.execute_command(command, self):
+            return True
+        # Already clear: nothing to record
+        return command.was_noop
     
     # =============================================================================
     # UNDO/REDO OPERATIONS
@@ -498,7 +827,21 @@ class HexGrid:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        playable_cells = list(self.get_playable_cells().keys())
+        # Memoized per revision: validate_puzzle and get_statistics both ask.
+        # A loaded graph can be edited in place without a revision bump, so
+        # only parity adjacency is cached (as in get_neighbors).
+        if self.loaded_adjacency is not None:
+            return self._check_connectivity()
+        result, cached_revision = self._connectivity_cache
+        if result is not None and cached_revision == self.revision:
+            return result
+        result = self._check_connectivity()
+        self._connectivity_cache = (result, self.revision)
+        return result
+    
+    def _check_connectivity(self) -> Tuple[bool, str]:
+        """Uncached body of validate_connectivity()."""
+        playable_cells = self._playable_set
         
         if not playable_cells:
             return False, "No playable cells found"
@@ -506,19 +849,16 @@ class HexGrid:
         if len(playable_cells) == 1:
             return True, ""
         
-        # BFS to check connectivity
-        visited = set()
-        queue = [playable_cells[0]]
-        visited.add(playable_cells[0])
+        # BFS to check connectivity (deque: O(1) dequeue; set: O(1) membership)
+        start = min(playable_cells)
+        visited = {start}
+        queue = deque((start,))
         
         while queue:
-            current_row, current_col = queue.pop(0)
-            neighbors = self.get_neighbors(current_row, current_col)
-            
-            for (nr, nc) in neighbors:
-                if (nr, nc) in playable_cells and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
+            for nbr in self.get_neighbors(*queue.popleft()):
+                if nbr in playable_cells and nbr not in visited:
+                    visited.add(nbr)
+                    queue.append(nbr)
         
         if len(visited) == len(playable_cells):
             return True, ""
@@ -536,7 +876,20 @@ class HexGrid:
         - Graph connectivity must hold (single component)
         - Duplicate values are not allowed
         - Prefilled values must be in range [1..max_value]
+        
+        Results are memoized per revision (parity grids only, as in
+        validate_connectivity); callers get their own list.
         """
+        if self.loaded_adjacency is not None:
+            return self._check_puzzle()
+        errors, cached_revision = self._validation_cache
+        if errors is None or cached_revision != self.revision:
+            errors = tuple(self._check_puzzle())
+            self._validation_cache = (errors, self.revision)
+        return list(errors)
+    
+    def _check_puzzle(self) -> List[ValidationError]:
+        """Uncached body of validate_puzzle()."""
         errors: List[ValidationError] = []
 
         # ---------------------------
@@ -549,29 +902,27 @@ class HexGrid:
         # ---------------------------------------
         # B) Duplicate values (original feature)
         # ---------------------------------------
-        value_locations: Dict[int, Tuple[int, int]] = {}
-        for (row, col), (state, value) in self.cell_states.items():
-            if state == CellState.PREFILLED and value is not None:
-                if value in value_locations:
+        # Every holder after the first (in row-major order) is a duplicate
+        for value, holders in self._cells_by_value.items():
+            if len(holders) > 1:
+                for cell in sorted(holders)[1:]:
                     errors.append(ValidationError(
                         "error",
                         f"Duplicate value {value}",
-                        location=(row, col)
+                        location=cell
                     ))
-                else:
-                    value_locations[value] = (row, col)
 
         # -------------------------------------
         # C) Value ranges (original feature)
         # -------------------------------------
         max_val = self.get_max_possible_value()
-        for (row, col), (state, value) in self.cell_states.items():
-            if state == CellState.PREFILLED and value is not None:
-                if value < 1 or value > max_val:
+        for value, holders in self._cells_by_value.items():
+            if value < 1 or value > max_val:
+                for cell in sorted(holders):
                     errors.append(ValidationError(
                         "error",
                         f"Value {value} out of range (1-{max_val})",
-                        location=(row, col)
+                        location=cell
                     ))
 
         # -----------------------------------------------------------------
@@ -580,6 +931,9 @@ class HexGrid:
         #     - non-adjacent endpoints (active graph semantics)
         #     - (extra safety) non-playable endpoints
         # -----------------------------------------------------------------
+        playable = self._playable_set
+        adjacency = self._edge_lookup()
+        no_neighbors = ()
         for (cell1, cell2) in self.dot_constraints:
             if not self.cell_exists(*cell1) or not self.cell_exists(*cell2):
                 errors.append(ValidationError(
@@ -589,10 +943,7 @@ class HexGrid:
                 ))
                 continue
 
-            s1, _ = self.get_cell_state(*cell1)
-            s2, _ = self.get_cell_state(*cell2)
-            if s1 not in (CellState.EMPTY, CellState.PREFILLED) or \
-            s2 not in (CellState.EMPTY, CellState.PREFILLED):
+            if cell1 not in playable or cell2 not in playable:
                 errors.append(ValidationError(
                     "error",
                     "Constraint touches non-playable cell",
@@ -600,7 +951,7 @@ class HexGrid:
                 ))
                 continue
 
-            if cell2 not in self.get_neighbors(*cell1):
+            if cell2 not in adjacency.get(cell1, no_neighbors):
                 errors.append(ValidationError(
                     "error",
                     "Invalid constraint between non-adjacent cells",
@@ -729,21 +1080,20 @@ class HexGrid:
         - Else → check edge ∈ parity neighbors (get_neighbors)
         """
         v = []
+        playable = self._playable_set
+        adjacency = self._edge_lookup()
+        no_neighbors = ()
         for (a, b) in self.dot_constraints:
             # Reject any constraint touching holes/center/non-playable
-            st_a, _ = self.get_cell_state(*a)
-            st_b, _ = self.get_cell_state(*b)
-            if st_a not in (CellState.EMPTY, CellState.PREFILLED) or st_b not in (CellState.EMPTY, CellState.PREFILLED):
+            if a not in playable or b not in playable:
                 v.append(ValidationError("error", "Constraint touches non-playable cell", location=a))
                 continue
 
             # Active-graph edge check
-            if self.loaded_adjacency is not None:
-                nbrs = self.loaded_adjacency.get(a, set())
-                if b not in nbrs:
+            if b not in adjacency.get(a, no_neighbors):
+                if self.loaded_adjacency is not None:
                     v.append(ValidationError("error", "Constraint endpoints are not adjacent in graph", location=a))
-            else:
-                if b not in set(self.get_neighbors(*a)):
+                else:
                     v.append(ValidationError("error", "Constraint endpoints are not adjacent (parity)", location=a))
 
         return v
@@ -757,48 +1107,36 @@ class HexGrid:
         Returns:
             Dict with various statistics about the grid
         """
+        counts = self._state_counts
         stats = {
-            "empty_cells": 0,
-            "prefilled_cells": 0,
-            "blocked_cells": 0,
-            "center_cells": 0,
-            "hole_cells": 0,
-            "total_playable": 0,
-            "total_existing": 0,
+            "empty_cells": counts[CellState.EMPTY],
+            "prefilled_cells": counts[CellState.PREFILLED],
+            "blocked_cells": counts[CellState.NONPLAYABLE],
+            "center_cells": counts[CellState.CENTER],
+            "hole_cells": counts[CellState.HOLE],
+            "total_playable": len(self._playable_set),
+            "total_existing": len(self.cell_states) - counts[CellState.HOLE],
             "dot_constraints": len(self.dot_constraints)
         }
         
-        for (state, _) in self.cell_states.values():
-            if state == CellState.EMPTY:
-                stats["empty_cells"] += 1
-                stats["total_playable"] += 1
-                stats["total_existing"] += 1
-            elif state == CellState.PREFILLED:
-                stats["prefilled_cells"] += 1
-                stats["total_playable"] += 1
-                stats["total_existing"] += 1
-            elif state == CellState.NONPLAYABLE:
-                stats["blocked_cells"] += 1
-                stats["total_existing"] += 1
-            elif state == CellState.CENTER:
-                stats["center_cells"] += 1
-                stats["total_existing"] += 1
-            elif state == CellState.HOLE:
-                stats["hole_cells"] += 1
-        
-        validation_errors = self.validate_puzzle()
-        stats["errors"] = len([e for e in validation_errors if e.severity == "error"])
-        stats["warnings"] = len([e for e in validation_errors if e.severity == "warning"])
+        errors = warnings = 0
+        for e in self.validate_puzzle():
+            if e.severity == "error":
+                errors += 1
+            elif e.severity == "warning":
+                warnings += 1
+        stats["errors"] = errors
+        stats["warnings"] = warnings
         
         is_connected, _ = self.validate_connectivity()
         stats["is_connected"] = is_connected
         
         # Add undo/redo info
-        history_info = self.get_history_info()
+        total_commands, _, can_undo, can_redo = self.command_history.get_counts()
         stats.update({
-            "can_undo": history_info["can_undo"],
-            "can_redo": history_info["can_redo"],
-            "total_commands": history_info["total_commands"]
+            "can_undo": can_undo,
+            "can_redo": can_redo,
+            "total_commands": total_commands
         })
         
         return stats
@@ -829,10 +1167,8 @@ class HexGrid:
         
         grid = cls(rows, cols)
         
-        # Initialize all cells as holes
-        for row in range(rows):
-            for col in range(cols):
-                grid.cell_states[(row, col)] = (CellState.HOLE, None)
+        # Initialize all cells as holes (same keys, one C-level pass)
+        grid.cell_states = dict.fromkeys(grid.cell_states, HOLE_ENTRY)
         
         # Apply non-playable cosmetics (blocked tiles that aren't vertices)
         for coord in non_playable_list:
@@ -868,6 +1204,9 @@ class HexGrid:
             else:
                 grid.cell_states[(row, col)] = (CellState.EMPTY, None)
         
+        # Cells above were written directly; bring the indexes up to date
+        grid._rebuild_indexes()
+        
         # Set center cell if specified (center is non-playable by definition)
         if center_rc and isinstance(center_rc, list) and len(center_rc) == 2:
             center_row, center_col = int(center_rc[0]), int(center_rc[1])
@@ -910,7 +1249,12 @@ class HexGrid:
         if grid.center_location is not None and grid.loaded_adjacency is not None:
             grid._sanitize_center_in_loaded_graph()
         
-        # Add constraints (now get_neighbors will honor loaded_adjacency if present)
+        # Add constraints (adjacency honors loaded_adjacency if present).
+        # Nothing observes the grid yet, so pairs go straight into the set
+        # after the same checks add_dot_constraint() makes.
+        playable = grid._playable_set
+        adjacency = grid._edge_lookup()
+        no_neighbors = ()
         constraints = json_data.get("constraints", {})
         dots = constraints.get("dots", [])
         for dot_pair in dots:
@@ -924,45 +1268,42 @@ class HexGrid:
                     else:
                         r1, c1 = string_to_coordinate(v1_id)
                         r2, c2 = string_to_coordinate(v2_id)
-                    
-                    grid.add_dot_constraint((int(r1), int(c1)), (int(r2), int(c2)))
+                    cell1 = (int(r1), int(c1))
+                    cell2 = (int(r2), int(c2))
                 except Exception:
                     # Skip malformed constraints
                     continue
+                if (cell1 in playable and cell2 in playable and
+                        cell2 in adjacency.get(cell1, no_neighbors)):
+                    grid.dot_constraints.add(grid._normalize_constraint(cell1, cell2))
+        if grid.dot_constraints:
+            grid._changed()
         
         # Clear history after import (this is the initial state)
         grid.clear_history()
         
         return grid
     
-    def _build_adjacency_for_export(self) -> Dict[str, List[str]]:
+    def _build_adjacency_for_export(self, id_lookup: Optional[Dict[Tuple[int, int], str]] = None) -> Dict[str, List[str]]:
         """
         Build adjacency for export based on current mode:
         - If a loaded graph exists: export that topology verbatim (filtered to playable set)
         - Else: export canonical EVEN-R adjacency among playable cells
+        
+        id_lookup maps each playable cell to its vertex ID; it is built here
+        when the caller has not already done so.
         """
-        playable = set(self.get_playable_cells().keys())
-        adjacency: Dict[str, List[str]] = {}
+        if id_lookup is None:
+            id_lookup = {cell: coordinate_to_string(*cell) for cell in self._playable_set}
         if self.loaded_adjacency is not None:
-            for (r, c) in playable:
-                vid = coordinate_to_string(r, c)
-                nbrs = []
-                for (nr, nc) in self.loaded_adjacency.get((r, c), set()):
-                    if (nr, nc) in playable:
-                        nbrs.append(coordinate_to_string(nr, nc))
-                adjacency[vid] = sorted(nbrs)
-            return adjacency
+            graph = self.loaded_adjacency
+            no_neighbors = set()
+            return {vid: sorted(id_lookup[n] for n in graph.get(cell, no_neighbors) if n in id_lookup)
+                    for cell, vid in id_lookup.items()}
         
         # Fallback: compute from parity
-        for (row, col) in playable:
-            vertex_id = coordinate_to_string(row, col)
-            neighbors = self.get_neighbors(row, col)  # will compute parity in this branch
-            playable_neighbors = []
-            for (nr, nc) in neighbors:
-                if (nr, nc) in playable:
-                    playable_neighbors.append(coordinate_to_string(nr, nc))
-            adjacency[vertex_id] = sorted(playable_neighbors)
-        return adjacency
+        return {vid: sorted(id_lookup[n] for n in self.get_neighbors(*cell) if n in id_lookup)
+                for cell, vid in id_lookup.items()}
 
     def _collect_non_playable_for_export(self) -> List[str]:
         """
@@ -970,10 +1311,9 @@ class HexGrid:
         Includes all NONPLAYABLE cells and the center cell (if present).
         HOLE cells are *not* listed; they are rendered as empty space.
         """
-        non_playable: Set[Tuple[int, int]] = set()
-        for (row, col), (state, _) in self.cell_states.items():
-            if state == CellState.NONPLAYABLE:
-                non_playable.add((row, col))
+        blocked = CellState.NONPLAYABLE
+        non_playable: Set[Tuple[int, int]] = {
+            cell for cell, (state, _) in self.cell_states.items() if state is blocked}
         # Center SHOULD be listed as non-playable cosmetic too
         if self.center_location is not None:
             non_playable.add(self.center_location)
@@ -991,29 +1331,30 @@ class HexGrid:
         vertices = {}
         coordinates = {}
         playable_cells = self.get_playable_cells()
+        # Vertex IDs are formatted once per cell and looked up from here on
+        id_lookup: Dict[Tuple[int, int], str] = {cell: coordinate_to_string(*cell) for cell in playable_cells}
         
         # Build vertices and coordinates
         for (row, col), value in playable_cells.items():
-            vertex_id = coordinate_to_string(row, col)
+            vertex_id = id_lookup[(row, col)]
             vertices[vertex_id] = {"value": value}
             coordinates[vertex_id] = [row, col]
         
         # Build adjacency per rules
-        adjacency = self._build_adjacency_for_export()
+        adjacency = self._build_adjacency_for_export(id_lookup)
         
         # Export constraints, filtered by adjacency
         dots = []
         # Build a quick lookup from adjacency
         adj_lookup: Dict[str, Set[str]] = {k: set(vs) for k, vs in adjacency.items()}
         for (cell1, cell2) in self.dot_constraints:
-            if cell1 in playable_cells and cell2 in playable_cells:
-                v1_id = coordinate_to_string(cell1[0], cell1[1])
-                v2_id = coordinate_to_string(cell2[0], cell2[1])
+            if cell1 in id_lookup and cell2 in id_lookup:
+                v1_id = id_lookup[cell1]
+                v2_id = id_lookup[cell2]
                 # keep only if adjacency contains the edge
                 if v2_id in adj_lookup.get(v1_id, set()):
                     # canonicalize each pair and collect
-                    a, b = sorted([v1_id, v2_id])
-                    dots.append([a, b])
+                    dots.append([v1_id, v2_id] if v1_id <= v2_id else [v2_id, v1_id])
         
         # Build layout section
         layout = {
@@ -1056,8 +1397,18 @@ class HexGrid:
             json_data = json.load(f)
         return cls.from_json(json_data)
     
-    def save_json(self, filename: str, puzzle_id: str = "created_puzzle") -> None:
-        """Save grid to JSON file."""
-        with open(filename, 'w') as f:
+    def save_json(self, filename: str, puzzle_id: str = "created_puzzle", compact: bool = False) -> None:
+        """
+        Save grid to JSON file.
+        
+        compact drops indentation and padding, roughly halving the file and
+        the encoder's work; the default stays indented for readable diffs.
+        """
+        with open(filename, 'w', encoding='utf-8') as f:
             # Write with sorted keys for deterministic, diff-friendly output
-            json.dump(self.to_json(puzzle_id), f, indent=2, sort_keys=True)
\ No newline at end of file
+            if compact:
+                json.dump(self.to_json(puzzle_id), f, sort_keys=True,
+                          ensure_ascii=False, separators=(',', ':'))
+            else:
+                json.dump(self.to_json(puzzle_id), f, indent=2, sort_keys=True,
+                          ensure_ascii=False)
\ No newline at end of file
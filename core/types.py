@@ -13,8 +13,13 @@ class CellState(Enum):
     CENTER = "center"         # Special center cell
     HOLE = "hole"             # Cell doesn't exist (empty space)
 
+# cell_states entry reported for cells missing from the mapping
+HOLE_ENTRY: Tuple[CellState, Optional[int]] = (CellState.HOLE, None)
+
 class ValidationError:
     """Represents a validation error with severity and description."""
+    __slots__ = ('severity', 'message', 'location')
+    
     def __init__(self, severity: str, message: str, location: Optional[Tuple[int, int]] = None):
         self.severity = severity  # "error", "warning", "info"
         self.message = message
@@ -48,6 +48,7 @@ class HexCanvas:
         self.text_items = {}
         self.constraint_items = {}
         self.validation_items = {}
+        self._redraw_pending = False
 
         # Phase 4 additions
         self.constraint_editor: Optional[ConstraintEditor] = None
@@ -85,7 +86,7 @@ class HexCanvas:
             edges = set()
             for a, nbrs in adj.items():
                 for b in nbrs:
-                    edges.add(tuple(sorted([a, b])))
+                    edges.add((a, b) if a <= b else (b, a))
 
             def as_pair(x):
                 # x should be ["r,c","u,v"]; return sorted tuple
@@ -94,7 +95,7 @@ class HexCanvas:
                 a, b = x
                 if not (isinstance(a, str) and isinstance(b, str)):
                     return None
-                return tuple(sorted([a, b]))
+                return (a, b) if a <= b else (b, a)
 
             invalid = 0
             for pair in cons:
@@ -176,14 +177,12 @@ class HexCanvas:
             return
         
         # CRITICAL FIX: Check batch selection mode FIRST, regardless of edit mode
-        if (hasattr(self, 'enhanced_mode') and self.enhanced_mode and 
-            hasattr(self, 'constraint_editor') and self.constraint_editor and
-            self.constraint_editor.selection_mode):
+        if self.is_batch_selection_active():
             
             # In batch selection mode - handle selection regardless of edit mode radio button
             handled = self.constraint_editor.toggle_cell_selection(row, col)
             if handled:
-                self.redraw_grid()  # Show selection changes
+                # Guides were patched by the editor; the grid itself didn't change
                 self._notify_grid_change()  # Update status
                 return  # Exit early - batch selection overrides everything
         
@@ -203,9 +202,8 @@ class HexCanvas:
 
     def is_batch_selection_active(self) -> bool:
         """Check if batch selection mode is currently active."""
-        return (hasattr(self, 'enhanced_mode') and self.enhanced_mode and 
-                hasattr(self, 'constraint_editor') and self.constraint_editor and
-                self.constraint_editor.selection_mode)
+        editor = self.constraint_editor
+        return self.enhanced_mode and editor is not None and editor.selection_mode
 
     def _on_right_click(self, event):
         """Handle right mouse clicks (number input)."""
@@ -234,7 +232,7 @@ class HexCanvas:
     def _on_mouse_motion(self, event):
         """Handle mouse motion for constraint preview and position tracking."""
         # Always update position regardless of mode
-        if hasattr(self, 'position_callback') and self.position_callback:
+        if self.position_callback:
             row, col = self.renderer.pixel_to_evenr(
                 event.x, event.y,
                 self.canvas_offset_x, self.canvas_offset_y
@@ -400,6 +398,9 @@ class HexCanvas:
         )
         
         if result is not None:
+            if current_state == CellState.PREFILLED and result == current_value:
+                return  # Unchanged; nothing to record or redraw
+            
             # Use command-based method for undo/redo support
             success = self.grid.cmd_set_cell_value(row, col, result)
             if not success:
@@ -466,6 +467,22 @@ class HexCanvas:
     
     # All other existing methods remain the same
     
+    def redraw_idle(self):
+        """Schedule a full redraw for the next idle cycle.
+
+        Repeated calls before the event loop goes idle collapse into a
+        single redraw_grid().
+        """
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        self.canvas.after_idle(self._do_redraw)
+
+    def _do_redraw(self):
+        """Idle callback for redraw_idle()."""
+        self._redraw_pending = False
+        self.redraw_grid()
+
     def redraw_grid(self):
         """Completely redraw the grid on the canvas."""
         if self.grid is None:
@@ -496,9 +513,7 @@ class HexCanvas:
             self._highlight_cell(*self.constraint_start_cell, "yellow")
         
         # CRITICAL: Update batch selection visual guides
-        if (hasattr(self, 'constraint_editor') and self.constraint_editor and
-            hasattr(self.constraint_editor, 'selection_mode') and 
-            self.constraint_editor.selection_mode):
+        if self.constraint_editor is not None and self.constraint_editor.selection_mode:
             self.constraint_editor._update_visual_guides()
 
         self._draw_inspect_overlay()
@@ -506,6 +521,45 @@ class HexCanvas:
         # Draw start/end highlight rings on top of everything else
         self._draw_endpoint_highlights()
     
+    # (fill, outline) per drawn cell state
+    _CELL_COLORS = {
+        CellState.EMPTY: ("white", "black"),
+        CellState.PREFILLED: ("orange", "black"),
+        CellState.NONPLAYABLE: ("gray", "darkgray"),
+        CellState.CENTER: ("lightblue", "blue"),
+    }
+    
+    def redraw_cell(self, row: int, col: int):
+        """
+        Refresh one drawn cell's colors and number in place.
+        
+        Much cheaper than redraw_grid() for value edits; validation marks,
+        constraints and overlays are left as they are until the next full redraw.
+        Falls back to redraw_grid() if the cell isn't drawn (e.g. it was a hole).
+        """
+        item_id = self.cell_items.get((row, col))
+        state, value = self.grid.get_cell_state(row, col)
+        if item_id is None or state == CellState.HOLE:
+            self.redraw_grid()
+            return
+        
+        fill_color, outline_color = self._CELL_COLORS.get(state, ("white", "black"))
+        self.canvas.itemconfigure(item_id, fill=fill_color, outline=outline_color)
+        
+        text_id = self.text_items.get((row, col))
+        if value is None:
+            if text_id is not None:
+                self.canvas.delete(text_id)
+                del self.text_items[(row, col)]
+        elif text_id is not None:
+            self.canvas.itemconfigure(text_id, text=str(value))
+        else:
+            self.text_items[(row, col)] = self.renderer.draw_text_in_hex(
+                self.canvas, row, col, str(value),
+                offset_x=self.canvas_offset_x,
+                offset_y=self.canvas_offset_y
+            )
+    
     def _draw_cell(self, row: int, col: int):
         """Draw a single cell with appropriate styling."""
         state, value = self.grid.get_cell_state(row, col)
@@ -515,21 +569,7 @@ class HexCanvas:
             return
         
         # Choose colors based on state
-        if state == CellState.EMPTY:
-            fill_color = "white"
-            outline_color = "black"
-        elif state == CellState.PREFILLED:
-            fill_color = "orange"
-            outline_color = "black"
-        elif state == CellState.NONPLAYABLE:
-            fill_color = "gray"
-            outline_color = "darkgray"
-        elif state == CellState.CENTER:
-            fill_color = "lightblue"
-            outline_color = "blue"
-        else:
-            fill_color = "white"
-            outline_color = "black"
+        fill_color, outline_color = self._CELL_COLORS.get(state, ("white", "black"))
         
         # Draw hexagon
         item_id = self.renderer.draw_hexagon(
@@ -730,20 +770,33 @@ class HexCanvas:
         5) Optionally run auto-clean (should be 0 typically, since loader already ignored)
         6) Show summary including 'invalid in file (ignored on load)'
         """
-        path = filedialog.askopenfilename(
-            title="Import Puzzle JSON",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-        )
+        path = self.ask_import_path()
         if not path:
             return
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                json_data = json.load(f)
+            json_data = self.read_import_file(path)
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to read JSON: {e}")
             return
 
+        self.apply_import(json_data)
+
+    def ask_import_path(self) -> str:
+        """Ask the user for a puzzle file; returns '' when cancelled."""
+        return filedialog.askopenfilename(
+            title="Import Puzzle JSON",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+
+    @staticmethod
+    def read_import_file(path: str) -> dict:
+        """Read and parse a puzzle file. Touches no Tk state, so it is safe off the UI thread."""
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def apply_import(self, json_data: dict) -> None:
+        """Import already-parsed puzzle JSON into the grid (steps 2-6 of import_puzzle)."""
         # --- Phase-3 Option A: pre-scan invalid constraints from the FILE itself
         invalid_in_file = self._count_invalid_constraints_in_file(json_data)
 
@@ -19,6 +19,16 @@ class EnhancedStatusBar:
         self.operation_status = ""
         self.position_info = ""
 
+        # Last text written per StringVar; identical writes are skipped
+        self._last_text = {}
+
+    def _set(self, var: tk.StringVar, text: str):
+        """Set a zone's text only if it differs from the last write."""
+        key = str(var)
+        if self._last_text.get(key) != text:
+            self._last_text[key] = text
+            var.set(text)
+
     def _create_status_zones(self):
         """Create different zones of the status bar."""
         # Main status (left side)
@@ -47,20 +57,20 @@ class EnhancedStatusBar:
     
     def update_main_status(self, status: str):
         """Update main status message."""
-        self.main_status.set(status)
+        self._set(self.main_status, status)
     
     def update_validation_status(self, errors: int, warnings: int):
         """Update validation status zone."""
         if errors > 0:
-            self.validation_var.set(f"❌ {errors} errors")
+            self._set(self.validation_var, f"❌ {errors} errors")
         elif warnings > 0:
-            self.validation_var.set(f"⚠️ {warnings} warnings")
+            self._set(self.validation_var, f"⚠️ {warnings} warnings")
         else:
-            self.validation_var.set("✅ Valid")
+            self._set(self.validation_var, "✅ Valid")
     
     def update_position(self, row: Optional[int] = None, col: Optional[int] = None):
         """Update mouse position info."""
         if row is not None and col is not None:
-            self.position_var.set(f"({row},{col})")
+            self._set(self.position_var, f"({row},{col})")
         else:
-            self.position_var.set("")
\ No newline at end of file
+            self._set(self.position_var, "")
\ No newline at end of file
@@ -24,6 +24,13 @@ class HexRenderer:
         self.hex_spacing_x = hex_size * math.sqrt(3)  # Distance between hex centers horizontally
         self.hex_spacing_y = hex_size * 1.5  # Distance between hex centers vertically
         
+        # Vertex offsets from the hex center, top vertex first, clockwise (pointy-top)
+        self._vertex_offsets: List[Tuple[float, float]] = []
+        for i in range(6):
+            angle = math.pi / 2 - (math.pi / 3 * i)
+            self._vertex_offsets.append((hex_size * math.cos(angle),
+                                         -hex_size * math.sin(angle)))  # Negative for screen coordinates
+        
     def evenr_to_pixel(self, row: int, col: int, offset_x: float = 50, offset_y: float = 50) -> Tuple[float, float]:
         """
         Convert EVEN-R coordinates to pixel coordinates for proper hexagonal layout.
@@ -86,12 +93,10 @@ class HexRenderer:
             List of coordinates [x1, y1, x2, y2, ...] for polygon
         """
         points = []
-        # Start from top vertex and go clockwise (pointy-top hexagon)
-        for i in range(6):
-            angle = math.pi / 2 - (math.pi / 3 * i)  # Start from top, go clockwise
-            x = center_x + self.hex_size * math.cos(angle)
-            y = center_y - self.hex_size * math.sin(angle)  # Negative for screen coordinates
-            points.extend([x, y])
+        # Start from top vertex and go clockwise (offsets precomputed in __init__)
+        for dx, dy in self._vertex_offsets:
+            points.append(center_x + dx)
+            points.append(center_y + dy)
         return points
     
     def draw_hexagon(self, canvas: tk.Canvas, row: int, col: int, 
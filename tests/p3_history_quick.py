@@ -0,0 +1,309 @@
+"""
+Command history round-trips:
+- Importing a puzzle over an edited grid and undoing restores the edits exactly
+- Redo re-applies the imported puzzle
+- History is capped at max_history and a new command drops the redo branch
+- Rapid repeat edits of one cell merge into a single undo step
+- A failing batch leaves the grid exactly as it was
+- Edits that change nothing are neither applied nor recorded
+- Bulk constraint add is one history entry and undoes symmetrically
+- Undo restores the center only for edits that could move it
+- A one-command batch is the command itself
+- A recorded live batch is not re-applied, and redo replays it
+- Bulk state and value edits are one entry, skip unchanged cells and undo exactly
+- Clearing the grid is one command that undoes and redoes exactly
+- Nested constraint delta logs are closed by identity, not by equal contents
+- Low-memory history trimming samples system memory at most once per interval
+"""
+
+import json
+
+from conftest import load_puzzle
+from core.hex_grid import HexGrid
+from core.types import CellState
+
+
+def _snapshot(g):
+    return (dict(g.cell_states), set(g.dot_constraints), g.rows, g.cols,
+            g.center_location, g.loaded_adjacency)
+
+
+def test_import_undo_restores_previous_grid():
+    g = HexGrid(5, 5)
+    g.cmd_set_cell_state(1, 1, CellState.NONPLAYABLE)
+    g.cmd_set_cell_value(2, 2, 3)
+    g.cmd_add_dot_constraint((0, 0), (0, 1))
+    before = _snapshot(g)
+
+    with open("puzzles_json/puzzle17.json", "r") as f:
+        data = json.load(f)
+    assert g.cmd_import_puzzle(data) is True
+    imported = _snapshot(g)
+    assert imported != before
+
+    assert g.undo() is True
+    assert _snapshot(g) == before
+
+    assert g.redo() is True
+    assert _snapshot(g) == imported
+
+
+def test_history_cap_and_redo_branch():
+    g = HexGrid(5, 5)
+    g.command_history = type(g.command_history)(max_history=3)
+    for col in range(5):
+        assert g.cmd_set_cell_value(0, col, col + 1) is True
+
+    info = g.get_history_info()
+    assert info["total_commands"] == 3
+    assert info["trimmed_commands"] == 2
+
+    assert g.undo() and g.undo()
+    assert g.can_redo()
+    assert g.cmd_set_cell_value(4, 4, 9) is True
+    assert not g.can_redo()
+    assert g.get_history_info()["total_commands"] == 2
+
+
+def test_rapid_same_cell_edits_merge():
+    g = HexGrid(5, 5)
+    for _ in range(4):
+        assert g.cmd_cycle_cell_state(2, 2) is True
+    # EMPTY -> NONPLAYABLE -> HOLE -> EMPTY -> NONPLAYABLE
+    assert g.get_cell_state(2, 2)[0] == CellState.NONPLAYABLE
+    assert g.get_history_info()["total_commands"] == 1
+
+    assert g.undo() is True
+    assert g.get_cell_state(2, 2) == (CellState.EMPTY, None)
+    assert g.redo() is True
+    assert g.get_cell_state(2, 2)[0] == CellState.NONPLAYABLE
+
+    # A different cell starts a new entry
+    assert g.cmd_set_cell_value(1, 1, 5) is True
+    assert g.cmd_set_cell_value(1, 1, 6) is True
+    assert g.get_history_info()["total_commands"] == 2
+    assert g.undo() is True
+    assert g.get_cell_state(1, 1) == (CellState.EMPTY, None)
+
+
+def test_failed_batch_rolls_back():
+    from core.commands import BatchCommand, SetCellValueCommand
+
+    g = HexGrid(5, 5)
+    g.cmd_add_dot_constraint((0, 0), (0, 1))
+    before = _snapshot(g)
+
+    # Second value duplicates the first, so the batch must fail as a whole
+    batch = BatchCommand([SetCellValueCommand(0, 0, 1), SetCellValueCommand(0, 1, 1)], "dup")
+    assert g.command_history.execute_command(batch, g) is False
+    assert _snapshot(g) == before
+    assert g.get_history_info()["total_commands"] == 1
+
+
+def test_failed_batch_rolls_back_constraints():
+    from core.commands import (BatchCommand, AddDotConstraintCommand,
+                               RemoveDotConstraintCommand, SetCellValueCommand)
+
+    g = HexGrid(5, 5)
+    g.cmd_add_dot_constraint((0, 0), (0, 1))
+    before = _snapshot(g)
+
+    batch = BatchCommand([RemoveDotConstraintCommand((0, 0), (0, 1)),
+                          AddDotConstraintCommand((1, 1), (1, 2)),
+                          SetCellValueCommand(2, 2, 999)], "mixed")
+    assert g.command_history.execute_command(batch, g) is False
+    assert _snapshot(g) == before
+    assert g._delta_logs == []
+
+
+def test_noop_edits_are_not_recorded():
+    from core.commands import BatchCommand, SetCellValueCommand
+
+    from core.commands import SetCellStateCommand
+
+    # was_noop defaults to False before execute()
+    assert SetCellStateCommand(0, 0, CellState.EMPTY).was_noop is False
+    assert SetCellValueCommand(0, 0, 1).was_noop is False
+
+    g = HexGrid(5, 5)
+    assert g.cmd_set_cell_value(0, 0, 1) is True
+    revision = g.revision
+
+    assert g.cmd_set_cell_value(0, 0, 1) is False
+    assert g.cmd_set_cell_state(1, 1, CellState.EMPTY) is False
+    assert g.revision == revision
+    assert g.get_history_info()["total_commands"] == 1
+
+    # No-op children are skipped, the rest of the batch still applies
+    batch = BatchCommand([SetCellValueCommand(0, 0, 1), SetCellValueCommand(0, 1, 2)], "number")
+    assert g.command_history.execute_command(batch, g) is True
+    assert batch.executed_commands == [batch.commands[1]]
+    assert g.get_history_info()["total_commands"] == 2
+
+
+def test_bulk_constraints_single_entry():
+    from core.commands import BulkAddDotConstraintsCommand
+
+    g = HexGrid(5, 5)
+    g.add_dot_constraint((0, 0), (0, 1))
+    before = _snapshot(g)
+    pairs = [(c, n) for c in [(2, 2), (3, 3)] for n in g.get_neighbors(*c)]
+    pairs.append(((0, 1), (0, 0)))  # already present, skipped
+
+    cmd = BulkAddDotConstraintsCommand(pairs)
+    assert g.command_history.execute_command(cmd, g) is True
+    assert len(cmd.added) == len(g.dot_constraints) - 1
+    assert g.get_history_info()["total_commands"] == 1
+
+    assert g.undo() is True
+    assert _snapshot(g) == before
+
+
+def test_center_undo_round_trip():
+    g = HexGrid(5, 5)
+    assert g.cmd_set_cell_state(2, 2, CellState.CENTER) is True
+    assert g.cmd_set_cell_state(1, 1, CellState.NONPLAYABLE) is True
+    assert g.cmd_cycle_cell_state(2, 2) is True  # CENTER -> EMPTY
+    assert g.center_location is None
+
+    assert g.undo() is True
+    assert g.center_location == (2, 2)
+    assert g.undo() is True
+    assert g.center_location == (2, 2)
+    assert g.undo() is True
+    assert g.center_location is None
+
+
+def test_single_child_batch_is_unwrapped():
+    from core.commands import BatchCommand, SetCellValueCommand
+
+    only = SetCellValueCommand(0, 0, 1)
+    assert BatchCommand.make([only], "one") is only
+    assert isinstance(BatchCommand.make([only, SetCellValueCommand(0, 1, 2)], "two"), BatchCommand)
+
+
+def test_live_batch_recorded_without_reapply():
+    from core.commands import LiveBatchCommand, SetCellValueCommand
+
+    g = HexGrid(5, 5)
+    live = LiveBatchCommand("number")
+    for col in range(3):
+        assert live.add_and_execute(g, SetCellValueCommand(0, col, col + 1))
+    numbered = _snapshot(g)
+    revision = g.revision
+
+    g.command_history.record_executed(live)
+    assert g.revision == revision
+    assert g.get_history_info()["total_commands"] == 1
+
+    assert g.undo() is True
+    assert g.get_cell_state(0, 0) == (CellState.EMPTY, None)
+    assert g.redo() is True
+    assert _snapshot(g) == numbered
+
+
+def test_bulk_state_and_value_commands():
+    from core.commands import BulkSetStateCommand, BulkSetValueCommand
+
+    g = HexGrid(5, 5)
+    g.set_cell_state(2, 2, CellState.CENTER)
+    g.set_cell_value(0, 0, 1)
+    g.set_cell_state(0, 1, CellState.NONPLAYABLE)
+    before = _snapshot(g)
+    revision = g.revision
+
+    cells = [(0, 0), (0, 1), (0, 2), (2, 2)]
+    cmd = BulkSetStateCommand(cells, CellState.NONPLAYABLE)
+    assert g.command_history.execute_command(cmd, g) is True
+    assert g.revision == revision + 1
+    assert set(cmd.old_entries) == {(0, 0), (0, 2), (2, 2)}
+    assert g.center_location is None
+    assert (0, 0) not in g.get_playable_cells_set()
+
+    # The center is back in place by the time undo bumps the revision
+    seen = []
+    changed = g._changed
+    g._changed = lambda: (seen.append(g.center_location), changed())
+    assert g.undo() is True
+    del g._changed
+    assert seen == [(2, 2)]
+    assert _snapshot(g) == before
+
+    # Values may be swapped within the batch; a clash outside it fails whole
+    cells = [(0, 0), (1, 0), (1, 1)]
+    assert g.command_history.execute_command(BulkSetValueCommand(cells, [2, 1, 3]), g) is True
+    assert [g.get_cell_state(*c)[1] for c in cells] == [2, 1, 3]
+    numbered = _snapshot(g)
+    assert g.command_history.execute_command(BulkSetValueCommand([(3, 3)], [2]), g) is False
+    assert _snapshot(g) == numbered
+    assert g.get_history_info()["total_commands"] == 1
+
+    assert g.undo() is True
+    assert _snapshot(g) == before
+
+
+def test_clear_grid_round_trip():
+    g = HexGrid(5, 5)
+    g.cmd_set_cell_state(2, 2, CellState.CENTER)
+    g.cmd_set_cell_state(4, 4, CellState.HOLE)
+    g.cmd_set_cell_value(0, 0, 1)
+    g.cmd_add_dot_constraint((0, 0), (0, 1))
+    before = _snapshot(g)
+    entries = g.get_history_info()["total_commands"]
+
+    assert g.cmd_clear_grid() is True
+    assert g.get_history_info()["total_commands"] == entries + 1
+    assert set(g.cell_states.values()) == {(CellState.EMPTY, None)}
+    assert not g.dot_constraints and g.center_location is None
+    assert g.get_playable_count() == 25 and not g.has_duplicate_value(1)
+    cleared = _snapshot(g)
+
+    # Clearing an already clear grid records nothing
+    assert g.cmd_clear_grid() is True
+    assert g.get_history_info()["total_commands"] == entries + 1
+
+    assert g.undo() is True
+    assert _snapshot(g) == before
+    assert g.has_duplicate_value(1) and g.get_playable_count() == 23
+    assert g.redo() is True
+    assert _snapshot(g) == cleared
+
+
+def test_nested_delta_logs_close_by_identity():
+    g = HexGrid(5, 5)
+    outer = g.begin_delta_log()
+    inner = g.begin_delta_log()
+    assert g.end_delta_log(inner) is inner
+    assert g._delta_logs == [outer] and g._delta_logs[0] is outer
+
+    g.add_dot_constraint((0, 0), (0, 1))
+    assert inner == [] and outer == [("add", ((0, 0), (0, 1)))]
+    assert g.end_delta_log(outer) is outer
+    assert g._delta_logs == []
+
+    # Out-of-order close still drops only the given log
+    first, second = g.begin_delta_log(), g.begin_delta_log()
+    g.end_delta_log(first)
+    assert len(g._delta_logs) == 1 and g._delta_logs[0] is second
+
+
+def test_memory_trim_samples_at_most_once_per_interval(monkeypatch):
+    import core.commands as commands
+
+    samples = []
+
+    class FakePsutil:
+        @staticmethod
+        def virtual_memory():
+            samples.append(1)
+            return type("Mem", (), {"available": 0})()
+
+    monkeypatch.setattr(commands, "psutil", FakePsutil)
+    g = HexGrid(10, 10)
+    for col in range(10):
+        for row in range(4):
+            g.cmd_set_cell_value(row, col, row * 10 + col + 1)
+
+    # The 31st push samples and trims to MIN_HISTORY; the 9 after it don't sample
+    assert len(samples) == 1
+    assert g.get_history_info()["total_commands"] == commands.CommandHistory.MIN_HISTORY + 9
@@ -0,0 +1,206 @@
+"""
+Revision-keyed grid caches stay in step with edits:
+- Playable count follows state changes, undo and import
+- The playable cell set matches cell_states through edits, rollbacks and imports
+- Parity neighbors come from a per-shape table and still skip holes
+- Memoized neighbor lists are dropped only around hole transitions
+- Connectivity counts cells cut off by a wall of holes, memoized per revision
+- The value index matches cell_states through edits, rollbacks and imports
+- State counts behind get_statistics match a full scan
+- Validation results are reused until the grid changes
+- Fresh and imported grids set up their indexes exactly as a full rebuild would
+"""
+
+import json
+
+from conftest import load_puzzle
+from core.hex_grid import HexGrid
+from core.types import CellState
+
+
+def _playable(g):
+    return len(g.get_playable_cells())
+
+
+def test_playable_count_tracks_edits():
+    g = HexGrid(5, 5)
+    assert g.get_playable_count() == _playable(g)
+
+    g.cmd_set_cell_state(1, 1, CellState.NONPLAYABLE)
+    g.cmd_set_cell_state(2, 2, CellState.CENTER)
+    assert g.get_playable_count() == _playable(g)
+
+    g.undo()
+    assert g.get_playable_count() == _playable(g)
+
+    with open("puzzles_json/puzzle17.json", "r") as f:
+        g.cmd_import_puzzle(json.load(f))
+    assert g.get_playable_count() == _playable(g)
+    g.undo()
+    assert g.get_playable_count() == _playable(g)
+
+
+def test_playable_set_matches_cell_states():
+    from core.commands import BatchCommand, SetCellValueCommand
+
+    def expected(g):
+        return {cell for cell, (state, _) in g.cell_states.items()
+                if state in (CellState.EMPTY, CellState.PREFILLED)}
+
+    g = HexGrid(5, 5)
+    g.cmd_set_cell_state(2, 2, CellState.CENTER)
+    g.cmd_set_cell_state(3, 3, CellState.CENTER)  # moves the center, (2, 2) back to EMPTY
+    g.cmd_cycle_cell_state(1, 1)
+    g.cmd_set_cell_value(0, 0, 1)
+    assert g.get_playable_cells_set() == expected(g)
+
+    # Failing batch rolls back through restore_state
+    batch = BatchCommand([SetCellValueCommand(0, 1, 2), SetCellValueCommand(0, 2, 2)], "dup")
+    assert g.command_history.execute_command(batch, g) is False
+    assert g.get_playable_cells_set() == expected(g)
+
+    with open("puzzles_json/puzzle17.json", "r") as f:
+        g.cmd_import_puzzle(json.load(f))
+    assert g.get_playable_cells_set() == expected(g)
+    while g.undo():
+        assert g.get_playable_cells_set() == expected(g)
+    while g.redo():
+        assert g.get_playable_cells_set() == expected(g)
+
+
+def test_neighbor_table_matches_parity_helper():
+    from utils.hex_parity import get_hex_neighbors_evenr
+
+    g = HexGrid(6, 7)
+    g.set_cell_state(2, 3, CellState.HOLE)
+    g.set_cell_state(4, 4, CellState.NONPLAYABLE)
+    assert g._neighbor_table() is HexGrid(6, 7)._neighbor_table()
+
+    row_lengths = [g.cols] * g.rows
+    for row in range(g.rows):
+        for col in range(g.cols):
+            if (row, col) == (2, 3):
+                assert g.get_neighbors(row, col) == []
+                continue
+            expected = [n for n in get_hex_neighbors_evenr(row_lengths, row, col)
+                        if n != (2, 3)]
+            assert g.get_neighbors(row, col) == expected
+
+
+def test_neighbor_cache_follows_hole_edits():
+    g = HexGrid(5, 5)
+    before = g.get_neighbors(2, 2)
+    assert (2, 3) in before
+
+    g.set_cell_state(2, 3, CellState.NONPLAYABLE)
+    assert g.get_neighbors(2, 2) is before  # not a hole transition
+
+    g.cmd_set_cell_state(2, 3, CellState.HOLE)
+    assert (2, 3) not in g.get_neighbors(2, 2)
+    assert g.get_neighbors(2, 3) == []
+
+    assert g.undo() is True
+    assert g.get_neighbors(2, 2) == before
+    assert g.get_neighbors(2, 3) != []
+
+
+def test_connectivity_detects_cut_off_cells():
+    g = HexGrid(5, 5)
+    assert g.validate_connectivity() == (True, "")
+
+    for row in range(5):
+        g.set_cell_state(row, 2, CellState.HOLE)
+    ok, message = g.validate_connectivity()
+    assert not ok and message == "10 playable cells are disconnected"
+    assert g.validate_connectivity() is g._connectivity_cache[0]
+
+    g.set_cell_state(2, 2, CellState.EMPTY)  # reopen the wall
+    assert g.validate_connectivity() == (True, "")
+
+
+def test_value_index_matches_cell_states():
+    from core.commands import BatchCommand, SetCellValueCommand
+
+    def expected(g):
+        index = {}
+        for cell, (state, value) in g.cell_states.items():
+            if state == CellState.PREFILLED:
+                index.setdefault(value, set()).add(cell)
+        return index
+
+    g = HexGrid(5, 5)
+    g.cmd_set_cell_value(0, 0, 1)
+    g.cmd_set_cell_value(0, 1, 2)
+    g.cmd_set_cell_value(0, 1, 3)
+    g.cmd_cycle_cell_state(0, 0)  # PREFILLED -> NONPLAYABLE frees 1
+    assert g._cells_by_value == expected(g)
+    assert not g.has_duplicate_value(1)
+    assert g.has_duplicate_value(3) and not g.has_duplicate_value(3, exclude_cell=(0, 1))
+
+    batch = BatchCommand([SetCellValueCommand(1, 1, 4), SetCellValueCommand(1, 2, 3)], "dup")
+    assert g.command_history.execute_command(batch, g) is False
+    assert g._cells_by_value == expected(g)
+
+    assert g.undo() and g.undo()
+    assert g._cells_by_value == expected(g) == {1: {(0, 0)}}  # (0, 1) edits merged
+
+    with open("puzzles_json/puzzle17.json", "r") as f:
+        g.cmd_import_puzzle(json.load(f))
+    assert g._cells_by_value == expected(g)
+
+
+def test_state_counts_match_scan():
+    from collections import Counter
+    from core.commands import BulkSetStateCommand
+
+    def check(g):
+        scan = Counter(state for state, _ in g.cell_states.values())
+        assert g._state_counts == {state: scan[state] for state in CellState}
+        stats = g.get_statistics()
+        assert stats["total_existing"] == len(g.get_all_existing_cells())
+        assert stats["total_playable"] == _playable(g)
+
+    g = HexGrid(5, 5)
+    g.cmd_set_cell_state(2, 2, CellState.CENTER)
+    g.cmd_set_cell_value(0, 0, 1)
+    g.cmd_cycle_cell_state(1, 1)
+    g.cmd_cycle_cell_state(1, 1)
+    check(g)
+
+    g.command_history.execute_command(BulkSetStateCommand([(0, 0), (2, 2), (3, 3)], CellState.HOLE), g)
+    check(g)
+    assert g.undo() is True
+    check(g)
+
+    with open("puzzles_json/puzzle17.json", "r") as f:
+        g.cmd_import_puzzle(json.load(f))
+    check(g)
+
+
+def test_validation_memoized_per_revision():
+    g = HexGrid(5, 5)
+    g.set_cell_value(0, 0, 1)
+    g.set_cell_state(1, 1, CellState.PREFILLED, 1)  # duplicate, written directly
+    first = g.validate_puzzle()
+    assert [e.message for e in first] == ["Duplicate value 1"]
+
+    first.clear()  # callers get their own list
+    again = g.validate_puzzle()
+    assert len(again) == 1 and again[0] is g._validation_cache[0][0]
+
+    g.cmd_set_cell_state(1, 1, CellState.EMPTY)
+    assert g.validate_puzzle() == []
+
+
+def test_fresh_and_imported_indexes_match_rebuild():
+    def indexes(g):
+        return (set(g._playable_set), {v: set(c) for v, c in g._cells_by_value.items()},
+                dict(g._state_counts))
+
+    with open("puzzles_json/puzzle17.json", "r") as f:
+        data = json.load(f)
+    for g in (HexGrid(6, 7), HexGrid.from_json(data)):
+        built = indexes(g)
+        g._rebuild_indexes()
+        assert indexes(g) == built
+        assert list(g.cell_states) == [(r, c) for r in range(g.rows) for c in range(g.cols)]
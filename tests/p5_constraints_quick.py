@@ -0,0 +1,320 @@
+"""
+Constraint validator checks:
+- A long constraint chain is measured as one component, without recursion
+- The shared constraint graph is rebuilt after constraint edits
+- Possible pairs follow neighbor changes caused by grid edits
+- Selection pairs are reused until the selection or grid changes
+- The fast pair check agrees with the full placement validation
+- Selection state buckets follow selection and grid changes
+- Grow, shrink and neighbor selection use the hex neighborhood
+- Grow and neighbor selection skip holes still listed in a loaded graph
+- A batch state change to a non-playable state keeps only playable cells selected
+- Selection results go to the status sink instead of a modal dialog when one is set
+- Guide redraw requests are coalesced into one idle-time sync
+- Constraint analysis is reused until the grid changes
+- Position order from packed keys matches tuple order
+- Constraint density is measured against the adjacent playable pairs
+- The batch menu is built once per combination of selected cell kinds
+- Import keeps only constraints between adjacent playable cells
+- Constraint edges are checked against the active graph, loaded or parity
+"""
+
+import sys
+
+from core.constraints import ConstraintEditor, ConstraintValidator
+from core.hex_grid import HexGrid
+from core.types import CellState
+
+
+def test_long_chain_component_size():
+    g = HexGrid(1, 40)
+    for col in range(39):
+        assert g.add_dot_constraint((0, col), (0, col + 1))
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(60)
+    try:
+        conflicts = ConstraintValidator(g).detect_constraint_conflicts()
+    finally:
+        sys.setrecursionlimit(limit)
+    assert not [c for c in conflicts if c.type == "impossible_chain"]
+
+    # Half the cells leave play: the 40-cell chain now exceeds 20 playable cells
+    for col in range(0, 40, 2):
+        g.set_cell_state(0, col, CellState.NONPLAYABLE)
+    conflicts = ConstraintValidator(g).detect_constraint_conflicts()
+    assert [c for c in conflicts if c.type == "impossible_chain"]
+
+
+def test_constraint_graph_follows_edits():
+    g = HexGrid(5, 5)
+    validator = ConstraintValidator(g)
+    hub = (2, 2)
+    for nbr in g.get_neighbors(*hub)[:3]:
+        g.cmd_add_dot_constraint(hub, nbr)
+    assert [c for c in validator.detect_constraint_conflicts() if c.type == "overconstrained"]
+
+    g.undo()
+    assert not validator.detect_constraint_conflicts()
+
+
+def test_possible_pairs_follow_grid_edits():
+    g = HexGrid(5, 5)
+    editor = ConstraintEditor(None, g)
+    hub = (2, 2)
+    selected = {hub, *g.get_neighbors(*hub)}
+    pairs = editor.get_possible_constraints(selected)
+    assert all(a < b for a, b in pairs)
+    assert {(min(hub, n), max(hub, n)) for n in g.get_neighbors(*hub)} <= set(pairs)
+
+    # A HOLE drops out of the neighbor sets, so its pairs disappear
+    g.set_cell_state(2, 3, CellState.HOLE)
+    assert not [p for p in editor.get_possible_constraints(selected) if (2, 3) in p]
+
+
+def test_selection_pairs_cached_per_selection():
+    g = HexGrid(5, 5)
+    editor = ConstraintEditor(None, g)
+    editor.selected_cells = {(2, 2), *g.get_neighbors(2, 2)}
+    editor._selection_changed()
+    pairs = editor.selection_pairs()
+    assert editor.selection_pairs() is pairs
+
+    editor.selected_cells.discard((2, 2))
+    editor._selection_changed()
+    assert len(editor.selection_pairs()) < len(pairs)
+
+    before = editor.selection_pairs()
+    g.cmd_set_cell_value(0, 0, 1)
+    assert editor.selection_pairs() is not before
+
+
+def test_is_valid_pair_matches_placement_errors():
+    g = HexGrid(5, 5)
+    g.set_cell_state(1, 1, CellState.NONPLAYABLE)
+    g.set_cell_state(2, 2, CellState.CENTER)
+    g.set_cell_state(3, 3, CellState.HOLE)
+    g.set_cell_value(0, 0, 4)
+    validator = ConstraintValidator(g)
+
+    cells = [(r, c) for r in range(-1, 6) for c in range(-1, 6)]
+    for a in cells:
+        for b in cells:
+            errors = validator.validate_constraint_placement(a, b)
+            expected = not any(e.severity == "error" for e in errors)
+            assert validator.is_valid_pair(a, b) is expected, (a, b)
+
+
+def test_selection_classification_cache():
+    g = HexGrid(5, 5)
+    editor = ConstraintEditor(None, g)
+    editor.selected_cells = {(0, 0), (0, 1), (1, 1)}
+    editor._selection_changed()
+    g.set_cell_value(0, 1, 3)
+    g.set_cell_state(1, 1, CellState.NONPLAYABLE)
+
+    buckets = editor._classify_selection()
+    assert buckets == {CellState.EMPTY: [(0, 0)], CellState.PREFILLED: [(0, 1)],
+                       CellState.NONPLAYABLE: [(1, 1)]}
+    assert editor._classify_selection() is buckets
+    assert editor._selected_playable() == {(0, 0), (0, 1)}
+
+    g.set_cell_state(0, 0, CellState.NONPLAYABLE)
+    assert sorted(editor._classify_selection()[CellState.NONPLAYABLE]) == [(0, 0), (1, 1)]
+
+
+def test_grow_shrink_neighbors():
+    g = HexGrid(7, 7)
+    g.set_cell_state(3, 4, CellState.HOLE)
+    editor = ConstraintEditor(None, g)
+    messages = []
+    editor.status_sink = messages.append
+    editor.selection_mode = True
+    editor._request_redraw = lambda: None
+    ring = set(g.get_neighbors(3, 3))
+    editor.selected_cells = {(3, 3)}
+    editor._selection_changed()
+
+    editor._grow_selection()
+    assert editor.selected_cells == {(3, 3)} | ring
+    assert (3, 4) not in editor.selected_cells
+    assert list(editor.selection_order) == sorted(ring)
+    assert messages[-1] == f"Grow Selection: Added {len(ring)} neighboring cells to selection"
+
+    editor._select_neighbors()
+    assert editor.selected_cells.isdisjoint(ring | {(3, 3)})
+
+    editor.selected_cells = {(3, 3)} | ring
+    editor._selection_changed()
+    editor.selection_order = dict.fromkeys(sorted(editor.selected_cells))
+    editor._shrink_selection()
+    assert (3, 3) in editor.selected_cells
+    assert list(editor.selection_order) == sorted(editor.selected_cells)
+    assert all(len(set(g.get_neighbors(*c)) & editor.selected_cells) >= 2
+               for c in editor.selected_cells)
+
+
+def test_batch_state_refreshes_selection_from_touched(monkeypatch):
+    import core.constraints as constraints
+    monkeypatch.setattr(constraints.messagebox, "showinfo", lambda *a, **k: None)
+
+    g = HexGrid(5, 5)
+    g.set_cell_value(0, 0, 1)
+    editor = ConstraintEditor(None, g)
+    editor.selection_mode = True
+    editor._request_redraw = lambda: None
+    editor.selected_cells = {(0, 0), (0, 1), (1, 1)}
+    editor._selection_changed()
+
+    assert editor._batch_set_state(CellState.EMPTY) is True
+    assert editor.selected_cells == {(0, 0), (0, 1), (1, 1)}
+    assert g.get_cell_state(0, 0) == (CellState.EMPTY, None)
+
+    assert editor._batch_set_state(CellState.HOLE) is True
+    assert editor.selected_cells == set()
+    assert g.undo() is True
+    assert g.get_playable_count() == 25
+
+    # Cells already blocked before the edit leave the selection too
+    g.set_cell_state(2, 2, CellState.NONPLAYABLE)
+    editor.selected_cells = {(2, 2), (2, 3)}
+    editor._selection_changed()
+    assert editor._batch_set_state(CellState.NONPLAYABLE) is True
+    assert editor.selected_cells == set()
+
+
+def test_guide_redraws_coalesce():
+    class _Canvas:
+        def __init__(self):
+            self.idle = []
+        def after_idle(self, callback):
+            self.idle.append(callback)
+
+    host = type("Host", (), {})()
+    host.canvas = _Canvas()
+    editor = ConstraintEditor(host, HexGrid(5, 5))
+    syncs = []
+    editor._update_visual_guides = lambda: syncs.append(1)
+
+    for _ in range(3):
+        editor._request_redraw()
+    assert len(host.canvas.idle) == 1 and syncs == []
+
+    host.canvas.idle.pop()()
+    assert syncs == [1]
+    editor._request_redraw()
+    assert len(host.canvas.idle) == 1
+
+
+def test_constraint_analysis_cached_by_revision():
+    g = HexGrid(5, 5)
+    editor = ConstraintEditor(None, g)
+    first = editor.get_constraint_analysis()
+    assert editor.get_constraint_analysis() is first
+
+    g.cmd_add_dot_constraint((0, 0), (0, 1))
+    second = editor.get_constraint_analysis()
+    assert second is not first
+    assert second["total_constraints"] == 1
+    assert g.undo() is True
+    assert editor.get_constraint_analysis()["total_constraints"] == 0
+
+
+def test_sorted_by_position_matches_tuple_sort():
+    from core.constraints import _sorted_by_position
+
+    cells = {(r, c) for r in range(7) for c in range(9) if (r * 5 + c) % 3}
+    assert _sorted_by_position(cells, 9) == sorted(cells)
+    assert _sorted_by_position(set(), 9) == []
+
+
+def test_density_uses_playable_edges():
+    g = HexGrid(2, 2)
+    v = ConstraintValidator(g)
+    # Even row 0 leans right: (0,0)-(0,1), (0,0)-(1,0), (0,0)-(1,1), (0,1)-(1,1), (1,0)-(1,1)
+    assert v.playable_edge_count() == 5
+
+    g.set_cell_state(1, 1, CellState.NONPLAYABLE)
+    assert v.playable_edge_count() == 2
+
+    editor = ConstraintEditor(None, g)
+    g.add_dot_constraint((0, 0), (0, 1))
+    assert editor.get_constraint_analysis()["density"] == 0.5
+
+
+def test_batch_menu_reused_per_selection_kind():
+    g = HexGrid(5, 5)
+    g.set_cell_value(0, 0, 1)
+    g.set_cell_state(4, 4, CellState.NONPLAYABLE)
+    editor = ConstraintEditor(None, g)
+    editor.selection_mode = True
+
+    editor.selected_cells = {(1, 1), (1, 2)}
+    editor._selection_changed()
+    empty_menu = editor.get_batch_operations_menu()
+    assert "Set All to Holes" in empty_menu and "Clear All Numbers" not in empty_menu
+
+    editor.selected_cells = {(2, 2)}
+    editor._selection_changed()
+    assert editor.get_batch_operations_menu() is empty_menu
+
+    editor.selected_cells = {(0, 0), (4, 4)}
+    editor._selection_changed()
+    mixed = editor.get_batch_operations_menu()
+    assert "Clear All Numbers" in mixed and "Set All to Empty" in mixed
+    assert mixed["Set All to Empty"].args == (CellState.EMPTY,)
+
+
+def test_import_keeps_only_valid_constraints():
+    g = HexGrid(5, 5)
+    g.set_cell_state(0, 2, CellState.NONPLAYABLE)
+    g.add_dot_constraint((2, 2), (2, 3))
+    data = g.to_json()
+    ids = {tuple(rc): vid for vid, rc in data["layout"]["coordinates"].items()}
+    data["constraints"]["dots"] += [[ids[(0, 0)], ids[(0, 1)]],
+                                    [ids[(0, 0)], ids[(4, 4)]],   # not adjacent
+                                    [ids[(1, 1)], "r0c2"],        # not a vertex
+                                    [ids[(1, 1)]]]                # malformed
+
+    imported = HexGrid.from_json(data)
+    assert imported.dot_constraints == {((2, 2), (2, 3)), ((0, 0), (0, 1))}
+    assert imported.get_history_info()["total_commands"] == 0
+
+
+def test_validation_checks_edges_in_active_graph():
+    g = HexGrid(5, 5)
+    g.add_dot_constraint((2, 2), (2, 3))
+    g.dot_constraints.add(((0, 0), (4, 4)))  # written directly, not an edge
+    g._changed()
+    messages = [e.message for e in g.validate_puzzle()]
+    assert messages.count("Invalid constraint between non-adjacent cells") == 1
+    assert len(g._validate_constraints_reference_edges()) == 1
+
+    # A loaded graph decides adjacency on its own
+    g.loaded_adjacency = {(2, 2): set(), (2, 3): set()}
+    assert len(g._validate_constraints_reference_edges()) == 2
+    assert g.add_dot_constraint((1, 1), (1, 2)) is False
+
+
+def test_selection_frontier_skips_holes_in_loaded_graph(monkeypatch):
+    import core.constraints as constraints
+    monkeypatch.setattr(constraints.messagebox, "showinfo", lambda *a, **k: None)
+
+    g = HexGrid.from_json(HexGrid(4, 4).to_json())
+    assert g.loaded_adjacency is not None
+    g.cmd_set_cell_state(1, 2, CellState.HOLE)
+    assert (1, 2) in g.get_neighbors(1, 1)  # the loaded graph still lists it
+
+    editor = ConstraintEditor(None, g)
+    editor.selection_mode = True
+    editor._request_redraw = lambda: None
+    editor.selected_cells = {(1, 1)}
+    editor._selection_changed()
+    assert (1, 2) not in editor._selection_frontier()
+
+    editor._grow_selection()
+    assert (1, 2) not in editor.selected_cells
+    editor.selected_cells = {(1, 1)}
+    editor._selection_changed()
+    editor._select_neighbors()
+    assert (1, 2) not in editor.selected_cells